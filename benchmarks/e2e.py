@@ -0,0 +1,228 @@
+"""End-to-end command latency benchmark against in-process fake servers.
+
+Drives every prefix and slash command of ServerInfoCog, StatsCog, PlaytimeCog,
+WaypointCog, ConfigCog and MetricsCog through fake Context/Interaction objects
+at a fixed concurrency and reports p50/p95/p99 latency and throughput per
+command. Run from the repository root:
+
+    python -m benchmarks.e2e [--requests 200] [--concurrency 20] [--latency-ms 5] [--only mcstat]
+"""
+import argparse
+import asyncio
+import os
+import re
+import tempfile
+import time
+from datetime import datetime
+
+import config
+import playtime
+import server_info
+import stats
+import waypoints
+from metrics import MetricsCog
+from persistence import WriteBehindStore
+from sessions import SessionTracker
+from status_cache import status_cache
+from utils import SERVER_CFG_PATH, WAYPOINTS_PATH
+from waypoint_table import WaypointTables
+
+from benchmarks.fakes import FakeAttachment, FakeContext, FakeGuild, FakeInteraction, FakeMember, FakeMinecraftServer
+
+GUILD_ID = 123456789012345678
+USER_ID  = 987654321098765432
+
+
+class FakeBot:
+    def __init__(self, server: FakeMinecraftServer, waypoint_count: int, data_dir: str):
+        gid = str(GUILD_ID)
+        self.server_configs = {gid: {"ip": server.host, "port": server.port, "password": server.password}}
+        today = datetime.now().strftime("%m/%d/%y")
+        self.all_waypoints = WaypointTables({gid: {
+            f"wp {i}": {"x": (i * 37) % 20000 - 10000, "y": 64, "z": (i * 91) % 20000 - 10000,
+                        "added_by": USER_ID, "added_at": today}
+            for i in range(waypoint_count)
+        }})
+        # never started: mark_dirty only records, as between two flushes in production
+        self.store = WriteBehindStore({
+            os.path.join(data_dir, SERVER_CFG_PATH): lambda: self.server_configs,
+            os.path.join(data_dir, WAYPOINTS_PATH):  lambda: self.all_waypoints,
+        })
+        self.status_poller = None
+
+
+def import_file(i: int, rows: int = 50) -> FakeAttachment:
+    lines = ["name,x,y,z"] + [f"import {i} {j},{j},64,{-j}" for j in range(rows)]
+    return FakeAttachment(f"import-{i}.csv", "\n".join(lines).encode())
+
+
+# prefix commands that read ctx.message.attachments
+ATTACHMENTS = {
+    "waypointimport": lambda i: [import_file(i)],
+}
+
+
+def prefix_args(server: FakeMinecraftServer):
+    """Command name -> i -> positional args for the prefix callback."""
+    return {
+        "mcstat":         lambda i: ("Player_000001", "obj_1"),
+        "mcstats":        lambda i: ("Player_000001",),
+        "mcleaderboard":  lambda i: ("obj_1", "10"),
+        "mctrack":        lambda i: ("obj_1",),
+        "mcuntrack":      lambda i: ("obj_1",),
+        "mcplaytime":     lambda i: (f"Player_{i % 8:06d}",),
+        "mcplaytop":      lambda i: (10,),
+        "waypointadd":    lambda i: (str(i), "64", str(-i), f"bench {i}"),
+        "waypointremove": lambda i: (f"bench {i}",),
+        "waypointinfo":   lambda i: ("wp", str(i % 100)),
+        "waypointnear":   lambda i: (i % 1000, -(i % 1000), 5),
+        "waypointsin":    lambda i: ("0", "0", "500"),
+        "config":         lambda i: (server.host, str(server.port), server.password),
+        "setserverinfo":  lambda i: (server.host, str(server.port), server.password),
+        "prefix":         lambda i: ("!",),
+    }
+
+
+def slash_args(server: FakeMinecraftServer):
+    """Command name -> i -> keyword args for the slash callback."""
+    return {
+        "mcstat":         lambda i: {"player": "Player_000001", "objective": "obj_1"},
+        "mcstats":        lambda i: {"player": "Player_000001"},
+        "mcleaderboard":  lambda i: {"objective": "obj_1", "count": 10},
+        "mctrack":        lambda i: {"objective": "obj_1"},
+        "mcuntrack":      lambda i: {"objective": "obj_1"},
+        "mcplaytime":     lambda i: {"player": f"Player_{i % 8:06d}"},
+        "mcplaytop":      lambda i: {"count": 10},
+        "waypointadd":    lambda i: {"x": i, "z": -i, "name": f"slash {i}", "y": 64},
+        "waypointremove": lambda i: {"name": f"slash {i}"},
+        "waypointinfo":   lambda i: {"name": f"wp {i % 100}"},
+        "waypointnear":   lambda i: {"x": i % 1000, "z": -(i % 1000), "k": 5},
+        "waypointsin":    lambda i: {"x": 0, "z": 0, "radius": 500},
+        "waypointimport": lambda i: {"file": import_file(-i - 1)},
+        "config":         lambda i: {"ip": server.host, "port": server.port, "password": server.password},
+        "setserverinfo":  lambda i: {"ip": server.host, "port": server.port, "password": server.password},
+        "prefix":         lambda i: {"new_prefix": "!"},
+    }
+
+
+def replied_error(sent) -> bool:
+    for content, _ in sent:
+        if content and content.startswith(("⚠️", "❌", "⏳")):
+            return True
+    return False
+
+
+def percentile(sorted_values, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[k]
+
+
+async def drive(make_call, requests: int, concurrency: int):
+    sem = asyncio.Semaphore(concurrency)
+    latencies, errors = [], 0
+
+    async def one(i):
+        nonlocal errors
+        async with sem:
+            start = time.perf_counter()
+            try:
+                sent = await make_call(i)
+                if replied_error(sent):
+                    errors += 1
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    wall = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    wall = time.perf_counter() - wall
+    latencies.sort()
+    return latencies, errors, wall
+
+
+async def run(args):
+    server = await FakeMinecraftServer(
+        players=args.players,
+        objectives=args.objectives,
+        scoreboard_entries=args.entries,
+        latency=args.latency_ms / 1000,
+    ).start()
+    status_cache.ttl = args.status_ttl
+    only = re.compile(args.only) if args.only else None
+    author = FakeMember(USER_ID)
+    guild = FakeGuild(GUILD_ID, [author])
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        bot = FakeBot(server, args.waypoints, data_dir)
+        # session polling isn't started; seed the tracker as one poll of the fake server would
+        playtime_cog = playtime.PlaytimeCog(bot)
+        playtime_cog.tracker = SessionTracker(os.path.join(data_dir, "sessions.jsonl"))
+        playtime_cog.tracker.observe(str(GUILD_ID), server.players)
+        cogs = [
+            server_info.ServerInfoCog(bot),
+            stats.StatsCog(bot),
+            playtime_cog,
+            waypoints.WaypointCog(bot),
+            config.ConfigCog(bot),
+            MetricsCog(bot),
+        ]
+        p_args, s_args = prefix_args(server), slash_args(server)
+
+        print(f"fake server on {server.host}:{server.port} • {args.requests} requests/command "
+              f"• concurrency {args.concurrency} • server latency {args.latency_ms} ms")
+        print(f"{'command':<24}{'kind':<8}{'n':>6}{'err':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'ops/s':>11}")
+        for cog in cogs:
+            runs = []
+            for cmd in cog.get_commands():
+                factory = p_args.get(cmd.name, lambda i: ())
+                attach = ATTACHMENTS.get(cmd.name, lambda i: ())
+
+                async def call(i, cmd=cmd, factory=factory, attach=attach, cog=cog):
+                    ctx = FakeContext(bot, guild, author, attach(i))
+                    await cmd.callback(cog, ctx, *factory(i))
+                    return ctx.sent
+                runs.append((cmd.name, "prefix", call))
+            for cmd in cog.get_app_commands():
+                factory = s_args.get(cmd.name, lambda i: {})
+
+                async def call(i, cmd=cmd, factory=factory, cog=cog):
+                    interaction = FakeInteraction(bot, guild, author)
+                    await cmd.callback(cog, interaction, **factory(i))
+                    return interaction.response.sent
+                runs.append((cmd.name, "slash", call))
+
+            for name, kind, call in runs:
+                if only and not only.search(name):
+                    continue
+                latencies, errors, wall = await drive(call, args.requests, args.concurrency)
+                ms = [t * 1000 for t in latencies]
+                print(f"{name:<24}{kind:<8}{len(ms):>6}{errors:>6}"
+                      f"{percentile(ms, 50):>10.2f}{percentile(ms, 95):>10.2f}{percentile(ms, 99):>10.2f}"
+                      f"{len(ms) / wall:>11,.0f}")
+
+    from rcon import rcon_clients
+    await rcon_clients.close()
+    await server.stop()
+    if server.rcon_rejected:
+        print(f"fake server dropped {server.rcon_rejected} RCON connection(s) on reads holding more than one packet")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200, help="invocations per command")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="fake server response delay")
+    parser.add_argument("--entries", type=int, default=1000, help="scoreboard entries per objective")
+    parser.add_argument("--objectives", type=int, default=10)
+    parser.add_argument("--players", type=int, default=8)
+    parser.add_argument("--waypoints", type=int, default=5000)
+    parser.add_argument("--status-ttl", type=float, default=0.0,
+                        help="status cache TTL in seconds (0 measures every ping)")
+    parser.add_argument("--only", help="regex; only run commands whose name matches")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+"""In-process stand-ins for a Minecraft server and for the Discord objects the cogs touch.
+
+FakeMinecraftServer answers Server List Ping and RCON on one TCP port (the bot's
+guild config uses a single port for both) and the Query protocol on the same
+UDP port. RCON is read the way vanilla reads it, one socket read per packet, and
+a read holding more (or less) than one packet drops the connection.
+"""
+import asyncio
+import json
+import struct
+import uuid
+from types import SimpleNamespace
+
+from rcon import RCON_FRAGMENT, TYPE_AUTH_RESPONSE, TYPE_COMMAND, TYPE_LOGIN, TYPE_RESPONSE, encode_packet
+
+RCON_READ_SIZE = 1460   # vanilla's RconClient reads into a buffer of this size
+
+
+def encode_varint(n: int) -> bytes:
+    out = bytearray()
+    n &= 0xFFFFFFFF
+    while True:
+        byte = n & 0x7F
+        n >>= 7
+        if n:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def decode_varint(data: bytes, pos: int = 0):
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+async def read_varint(reader: asyncio.StreamReader, first: bytes = b"") -> int:
+    data = bytearray(first)
+    while not data or data[-1] & 0x80:
+        data += await reader.readexactly(1)
+    return decode_varint(bytes(data))[0]
+
+
+def encode_string(s: str) -> bytes:
+    raw = s.encode("utf8")
+    return encode_varint(len(raw)) + raw
+
+
+class FakeMinecraftServer:
+    """Server List Ping + RCON (TCP) and Query (UDP) with configurable latency and payload size."""
+
+    def __init__(
+        self,
+        players: int = 8,
+        max_players: int = 100,
+        objectives: int = 10,
+        scoreboard_entries: int = 100,
+        password: str = "bench",
+        latency: float = 0.0,
+        version: str = "1.20.4",
+    ):
+        self.players = [f"Player_{i:06d}" for i in range(players)]
+        self.max_players = max_players
+        self.objectives = [f"obj_{i}" for i in range(objectives)]
+        self.scoreboard_entries = scoreboard_entries
+        self.password = password
+        self.latency = latency
+        self.version = version
+        self.host = "127.0.0.1"
+        self.port = None
+        self.rcon_rejected = 0   # RCON reads that weren't exactly one packet
+        self._tcp = None
+        self._udp = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self._tcp = await asyncio.start_server(self._handle_tcp, host, port)
+        self.port = self._tcp.sockets[0].getsockname()[1]
+        self._udp, _ = await asyncio.get_running_loop().create_datagram_endpoint(
+            lambda: _QueryProtocol(self), local_addr=(host, self.port)
+        )
+        return self
+
+    async def stop(self):
+        self._tcp.close()
+        await self._tcp.wait_closed()
+        self._udp.close()
+
+    async def _delay(self):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    async def _handle_tcp(self, reader, writer):
+        try:
+            head = await reader.readexactly(3)
+            # RCON opens with a little-endian int32 length (high bytes zero);
+            # SLP opens with a varint length, packet id 0 and a non-zero protocol version
+            if head[2] == 0:
+                await self._serve_rcon(head, reader, writer)
+            else:
+                await self._serve_slp(head, reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    #
+    # --- Server List Ping ---
+    #
+
+    def status_json(self) -> dict:
+        return {
+            "version":     {"name": self.version, "protocol": 765},
+            "players":     {
+                "max":    self.max_players,
+                "online": len(self.players),
+                "sample": [{"name": n, "id": str(uuid.uuid4())} for n in self.players[:12]],
+            },
+            "description": {"text": "A fake benchmark server"},
+        }
+
+    async def _serve_slp(self, head, reader, writer):
+        length, pos = decode_varint(head)
+        payload = head[pos:] + await reader.readexactly(length - (len(head) - pos))   # handshake; ignored
+        while True:
+            length = await read_varint(reader)
+            payload = await reader.readexactly(length)
+            packet_id, pos = decode_varint(payload)
+            await self._delay()
+            if packet_id == 0:
+                body = encode_varint(0) + encode_string(json.dumps(self.status_json()))
+            elif packet_id == 1:
+                body = encode_varint(1) + payload[pos:pos + 8]
+            else:
+                return
+            writer.write(encode_varint(len(body)) + body)
+            await writer.drain()
+
+    #
+    # --- RCON ---
+    #
+
+    def rcon_reply(self, cmd: str) -> str:
+        parts = cmd.split()
+        if cmd == "scoreboard objectives list":
+            return f"There are {len(self.objectives)} objective(s): " + ", ".join(f"[{o}]" for o in self.objectives)
+        if parts[:3] == ["scoreboard", "players", "list"]:
+            n = self.scoreboard_entries
+            return f"Showing {n} tracked entities: " + ", ".join(
+                f"Player_{i:06d} has {(i * 7919) % 100003}" for i in range(n)
+            )
+        if parts[:3] == ["scoreboard", "players", "get"] and len(parts) == 5:
+            return f"{parts[3]} has {len(parts[3]) * len(parts[4])} [{parts[4]}]"
+        if cmd == "time query daytime":
+            return "The time is 6000"
+        if cmd == "seed":
+            return "Seed: [-4172144997902289642]"
+        if cmd == "list":
+            return (f"There are {len(self.players)} of a max of {self.max_players} players online: "
+                    + ", ".join(self.players))
+        if cmd == "stop":
+            return "Stopping the server"
+        return f"Unknown or incomplete command, see below for error{cmd}<--[HERE]"
+
+    async def _read_rcon(self, reader, first: bytes = b""):
+        """One vanilla-style read: (req_id, type, body), or None if it isn't exactly one packet."""
+        data = first + await reader.read(RCON_READ_SIZE - len(first))
+        if len(data) < 14:
+            if data:
+                self.rcon_rejected += 1
+            return None
+        (length,) = struct.unpack("<i", data[:4])
+        if length != len(data) - 4:
+            self.rcon_rejected += 1
+            return None
+        req_id, ptype = struct.unpack("<ii", data[4:12])
+        return req_id, ptype, data[12:-2]
+
+    async def _serve_rcon(self, head, reader, writer):
+        packet = await self._read_rcon(reader, head)
+        if packet is None or packet[1] != TYPE_LOGIN:
+            return
+        req_id, _, body = packet
+        ok = body.decode("utf8") == self.password
+        writer.write(encode_packet(req_id if ok else -1, TYPE_AUTH_RESPONSE, ""))
+        await writer.drain()
+        if not ok:
+            return
+        while True:
+            packet = await self._read_rcon(reader)
+            if packet is None:
+                return
+            req_id, ptype, body = packet
+            if ptype == TYPE_COMMAND:
+                await self._delay()
+                reply = self.rcon_reply(body.decode("utf8"))   # ASCII, so characters are bytes
+                for i in range(0, max(len(reply), 1), RCON_FRAGMENT):
+                    writer.write(encode_packet(req_id, TYPE_RESPONSE, reply[i:i + RCON_FRAGMENT]))
+            else:
+                writer.write(encode_packet(req_id, TYPE_RESPONSE, f"Unknown request {ptype:x}"))
+            await writer.drain()
+
+
+class _QueryProtocol(asyncio.DatagramProtocol):
+    CHALLENGE = b"9513307"
+
+    def __init__(self, server: FakeMinecraftServer):
+        self.server = server
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        if data[:2] != b"\xfe\xfd":
+            return
+        ptype, session = data[2], data[3:7]
+        if ptype == 9:
+            reply = b"\x09" + session + self.CHALLENGE + b"\x00"
+        else:
+            s = self.server
+            kv = {
+                "hostname": "A fake benchmark server", "gametype": "SMP", "game_id": "MINECRAFT",
+                "version": s.version, "plugins": "", "map": "world",
+                "numplayers": str(len(s.players)), "maxplayers": str(s.max_players),
+                "hostport": str(s.port), "hostip": s.host,
+            }
+            reply = (
+                b"\x00" + session + b"splitnum\x00\x80\x00"
+                + b"".join(k.encode() + b"\x00" + v.encode() + b"\x00" for k, v in kv.items())
+                + b"\x00\x01player_\x00\x00"
+                + b"".join(n.encode() + b"\x00" for n in s.players) + b"\x00"
+            )
+        delay = self.server.latency
+        if delay:
+            asyncio.get_running_loop().call_later(delay, self.transport.sendto, reply, addr)
+        else:
+            self.transport.sendto(reply, addr)
+
+
+#
+# --- Discord stand-ins ---
+#
+
+class FakeMessage:
+    def __init__(self, attachments=()):
+        self.attachments = list(attachments)
+
+    async def edit(self, **kwargs):
+        return self
+
+
+class FakeAttachment:
+    def __init__(self, filename: str, data: bytes):
+        self.filename = filename
+        self.size = len(data)
+        self._data = data
+
+    async def read(self) -> bytes:
+        return self._data
+
+
+class FakeMember:
+    def __init__(self, member_id: int, name: str = "bench-user", admin: bool = True):
+        self.id = member_id
+        self.display_name = name
+        self.guild_permissions = SimpleNamespace(administrator=admin)
+
+    def __eq__(self, other):
+        return isinstance(other, FakeMember) and other.id == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+
+class FakeGuild:
+    def __init__(self, guild_id: int, members=()):
+        self.id = guild_id
+        self._members = {m.id: m for m in members}
+
+    def get_member(self, member_id: int):
+        return self._members.get(member_id)
+
+
+class FakeContext:
+    """Just enough of commands.Context for the cogs' prefix commands."""
+
+    def __init__(self, bot, guild: FakeGuild, author: FakeMember, attachments=()):
+        self.bot = bot
+        self.guild = guild
+        self.author = author
+        self.message = FakeMessage(attachments)
+        self.sent = []
+
+    async def send(self, content=None, **kwargs):
+        self.sent.append((content, kwargs))
+        return FakeMessage()
+
+
+class FakeResponse:
+    def __init__(self):
+        self.sent = []
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def send_message(self, content=None, **kwargs):
+        self._done = True
+        self.sent.append((content, kwargs))
+
+    async def edit_message(self, **kwargs):
+        self._done = True
+        self.sent.append((None, kwargs))
+
+    async def defer(self, **kwargs):
+        self._done = True
+
+    async def send_modal(self, modal):
+        self._done = True
+
+
+class FakeFollowup:
+    def __init__(self, response: FakeResponse):
+        self.response = response
+
+    async def send(self, content=None, **kwargs):
+        self.response.sent.append((content, kwargs))
+        return FakeMessage()
+
+
+class FakeInteraction:
+    """Just enough of discord.Interaction for the cogs' slash commands."""
+
+    def __init__(self, bot, guild: FakeGuild, user: FakeMember):
+        self.client = bot
+        self.guild = guild
+        self.guild_id = guild.id
+        self.user = user
+        self.response = FakeResponse()
+        self.followup = FakeFollowup(self.response)
+
+    async def original_response(self):
+        return FakeMessage()
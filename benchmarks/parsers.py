@@ -0,0 +1,89 @@
+"""Parse-throughput benchmarks for rcon_parsers over sample reply shapes.
+
+Run from the repository root:
+
+    python -m benchmarks.parsers [--sizes 10,100,1000,10000] [--repeat 5]
+"""
+import argparse
+import random
+import timeit
+
+import rcon_parsers
+
+# reply shapes the parsers accept: vanilla 1.20's wording, except "scores", which is the
+# `name has N` list iter_scores reads and not a vanilla reply; § codes as a plugin adds them
+SAMPLES = {
+    "objectives": "There are 3 objective(s): [Deaths], [§aKills§r], [blocks_mined]",
+    "scores":     "Showing 3 tracked entities: Steve has 12, Alex has 7, §6Notch§r has 1",
+    "score":      "Steve has 12 [Deaths]",
+    "players":    "There are 2 of a max of 20 players online: Steve, Alex",
+    "time":       "The time is 6000",
+    "seed":       "Seed: [-4172144997902289642]",
+}
+
+
+def name(i: int) -> str:
+    return f"Player_{i:06d}"
+
+
+def fixtures(size: int, rng: random.Random) -> dict:
+    """Sample shapes scaled to `size` entries."""
+    return {
+        "objectives": f"There are {size} objective(s): "
+                      + ", ".join(f"[obj_{i}]" for i in range(size)),
+        "scores":     f"Showing {size} tracked entities: "
+                      + ", ".join(f"{name(i)} has {rng.randint(-10**6, 10**6)}" for i in range(size)),
+        "scores_fmt": f"Showing {size} tracked entities: "
+                      + ", ".join(f"§{i % 10}{name(i)}§r has {rng.randint(0, 999)}" for i in range(size)),
+        "players":    f"There are {size} of a max of {size * 2} players online: "
+                      + ", ".join(name(i) for i in range(size)),
+    }
+
+
+CASES = [
+    ("objectives", "objectives", rcon_parsers.parse_objectives),
+    ("scores",     "scores",     lambda raw: list(rcon_parsers.iter_scores(raw))),
+    ("scores §",   "scores_fmt", lambda raw: list(rcon_parsers.iter_scores(raw))),
+    ("players",    "players",    rcon_parsers.parse_players),
+]
+
+SINGLE = [
+    ("score", "score", rcon_parsers.parse_score),
+    ("time",  "time",  rcon_parsers.parse_time),
+    ("seed",  "seed",  rcon_parsers.parse_seed),
+]
+
+
+def bench(fn, raw: str, repeat: int) -> float:
+    """Best-of-`repeat` seconds per call."""
+    timer = timeit.Timer(lambda: fn(raw))
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10,100,1000,10000")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",")]
+    rng = random.Random(0)
+
+    for label, key, fn in SINGLE + [(f"{l} (sample)", k, f) for l, k, f in CASES if k in SAMPLES]:
+        assert fn(SAMPLES[key]) is not None, label
+
+    print(f"{'case':<22}{'entries':>9}{'µs/call':>12}{'MB/s':>10}{'entries/s':>14}")
+    for label, key, fn in SINGLE:
+        raw = SAMPLES[key]
+        t = bench(fn, raw, args.repeat)
+        print(f"{label:<22}{1:>9}{t * 1e6:>12.2f}{len(raw) / t / 1e6:>10.1f}{1 / t:>14,.0f}")
+    for size in sizes:
+        data = fixtures(size, rng)
+        for label, key, fn in CASES:
+            raw = data[key]
+            t = bench(fn, raw, args.repeat)
+            print(f"{label:<22}{size:>9}{t * 1e6:>12.2f}{len(raw) / t / 1e6:>10.1f}{size / t:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
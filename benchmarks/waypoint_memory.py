@@ -0,0 +1,68 @@
+"""Memory per waypoint: plain JSON dicts vs WaypointTable.
+
+Each guild is loaded from JSON text the way bot.py loads waypoints.json, so
+strings and ints are not shared between records unless the representation
+shares them. Run from the repository root:
+
+    python -m benchmarks.waypoint_memory [--sizes 10000,100000,1000000] [--creators 50]
+"""
+import argparse
+import gc
+import json
+import random
+import tracemalloc
+from datetime import date, timedelta
+
+from waypoint_table import WaypointTable
+
+
+def waypoints_json(size: int, creators: int, rng: random.Random) -> str:
+    users = [rng.randrange(10**17, 10**18) for _ in range(creators)]
+    start = date(2024, 1, 1)
+    return json.dumps({
+        f"waypoint {i}": {
+            "x": rng.randint(-30_000_000, 30_000_000),
+            "y": rng.choice((None, rng.randint(-64, 320))),
+            "z": rng.randint(-30_000_000, 30_000_000),
+            "added_by": rng.choice(users),
+            "added_at": (start + timedelta(days=rng.randrange(700))).strftime("%m/%d/%y"),
+        }
+        for i in range(size)
+    })
+
+
+def measure(build, text: str):
+    """(bytes held after the build, peak bytes during it)."""
+    gc.collect()
+    tracemalloc.start()
+    obj = build(text)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return current, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--creators", type=int, default=50)
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    builds = [
+        ("dict",  json.loads),
+        ("table", lambda text: WaypointTable(json.loads(text))),
+    ]
+    print(f"{'repr':<8}{'waypoints':>11}{'bytes/wp':>10}{'peak/wp':>10}{'total MB':>10}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        text = waypoints_json(size, args.creators, rng)
+        base = None
+        for label, build in builds:
+            current, peak = measure(build, text)
+            base = base or current
+            print(f"{label:<8}{size:>11,}{current / size:>10.1f}{peak / size:>10.1f}"
+                  f"{current / 1e6:>10.1f}  ({current / base:.0%} of dict)")
+
+
+if __name__ == "__main__":
+    main()
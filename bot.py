@@ -1,32 +1,68 @@
 import os
+import sys
+import time
 import atexit
 import discord
 from discord.ext import commands
 from dotenv import load_dotenv
-from utils        import load_json, save_json, get_prefix, SERVER_CFG_PATH, WAYPOINTS_PATH
+from utils        import load_json, get_prefix, SERVER_CFG_PATH, WAYPOINTS_PATH
 from help_command import MyHelp, HelpCog
+from persistence  import WriteBehindStore
+from waypoint_table import WaypointTables
+from storage      import SqliteStorage, STORAGE_BACKEND, SQLITE_PATH
+from rcon         import rcon_clients
+from limits       import status_executor
+from poller       import StatusPoller, STATUS_POLL_ENABLED
+from tree_sync    import sync_if_changed
+from sharding     import SHARD_COUNT, SHARD_IDS, MULTI_PROCESS, PRIMARY
+from metrics      import MetricsCog, TimedCommandTree, METRICS_HOST, METRICS_PORT, observe_command, start_http
 
 import config
+import playtime
 import server_info
 import stats
 import waypoints
 
 load_dotenv()
 TOKEN = os.getenv("DISCORD_TOKEN")
+FORCE_SYNC = "--force-sync" in sys.argv
 
-class MyBot(commands.Bot):
+# SHARD_COUNT switches to AutoShardedBot; SHARD_IDS limits this process to a
+# range of those shards (see launcher.py)
+BotBase = commands.AutoShardedBot if SHARD_COUNT else commands.Bot
+
+class MyBot(BotBase):
     def __init__(self):
         intents = discord.Intents.default()
         intents.message_content = True
+        shard_kwargs = {"shard_count": SHARD_COUNT, "shard_ids": SHARD_IDS} if SHARD_COUNT else {}
         super().__init__(
             command_prefix=get_prefix,
             intents=intents,
-            help_command=MyHelp()
+            help_command=MyHelp(),
+            tree_cls=TimedCommandTree,
+            **shard_kwargs
         )
-        self.server_configs = load_json(SERVER_CFG_PATH)
-        self.all_waypoints  = load_json(WAYPOINTS_PATH)
+        if MULTI_PROCESS and STORAGE_BACKEND != "sqlite":
+            raise RuntimeError("Running a subset of shards needs STORAGE_BACKEND=sqlite to share state.")
+        if STORAGE_BACKEND == "sqlite":
+            self.store = SqliteStorage(SQLITE_PATH)
+            self.store.migrate_json(SERVER_CFG_PATH, WAYPOINTS_PATH)
+            self.server_configs = self.store.configs
+            self.all_waypoints  = self.store.waypoints
+        else:
+            self.server_configs = load_json(SERVER_CFG_PATH)
+            self.all_waypoints  = WaypointTables(load_json(WAYPOINTS_PATH))
+            self.store = WriteBehindStore({
+                SERVER_CFG_PATH: lambda: self.server_configs,
+                WAYPOINTS_PATH:  lambda: self.all_waypoints,
+            })
+        self.status_poller  = None
+        self.metrics_runner = None
 
     async def setup_hook(self):
+        self.store.start()
+
         for module in (config, server_info, stats):
             for attr in dir(module):
                 cmd = getattr(module, attr)
@@ -38,19 +74,48 @@ class MyBot(commands.Bot):
         await self.add_cog(config.ConfigCog(self))
         await self.add_cog(server_info.ServerInfoCog(self))
         await self.add_cog(stats.StatsCog(self))
-        
-        await self.tree.sync()
-        TEST_GUILD = discord.Object(id=800622420536590346)
-        await self.tree.sync(guild=TEST_GUILD)
+        await self.add_cog(playtime.PlaytimeCog(self))
+        await self.add_cog(MetricsCog(self))
+
+        if METRICS_PORT:
+            self.metrics_runner = await start_http(METRICS_HOST, int(METRICS_PORT))
+
+        if STATUS_POLL_ENABLED:
+            self.status_poller = StatusPoller(self)
+            self.status_poller.start()
+
+        if PRIMARY:
+            await sync_if_changed(self.tree, self.application_id, force=FORCE_SYNC)
+            TEST_GUILD = discord.Object(id=800622420536590346)
+            await sync_if_changed(self.tree, self.application_id, guild=TEST_GUILD, force=FORCE_SYNC)
+
+    async def invoke(self, ctx):
+        start = time.perf_counter()
+        try:
+            await super().invoke(ctx)
+        finally:
+            if ctx.command is not None:
+                observe_command(ctx.command.qualified_name, "prefix", ctx.guild and ctx.guild.id,
+                                time.perf_counter() - start, ctx.command_failed)
+
+    async def on_app_command_completion(self, interaction, command):
+        self.tree.observe(interaction, failed=False)
+
+    async def close(self):
+        if self.status_poller is not None:
+            await self.status_poller.stop()
+        if self.metrics_runner is not None:
+            await self.metrics_runner.cleanup()
+        await rcon_clients.close()
+        status_executor.shutdown(wait=False, cancel_futures=True)
+        await self.store.close()
+        await super().close()
 
     async def on_ready(self):
         print(f"Logged in as {self.user} (ID: {self.user.id})")
 
 bot = MyBot()
 
-atexit.register(lambda: (
-    save_json(SERVER_CFG_PATH, bot.server_configs),
-    save_json(WAYPOINTS_PATH,   bot.all_waypoints)
-))
+atexit.register(bot.store.flush_sync)
 
 bot.run(TOKEN)
@@ -0,0 +1,129 @@
+import asyncio
+import os
+import time
+from contextlib import contextmanager
+
+from limits import ServerBusy
+from metrics import metrics
+
+BREAKER_THRESHOLD    = int(os.getenv("MC_BREAKER_THRESHOLD", "3"))
+BREAKER_COOLDOWN     = float(os.getenv("MC_BREAKER_COOLDOWN", "10"))
+BREAKER_MAX_COOLDOWN = float(os.getenv("MC_BREAKER_MAX_COOLDOWN", "600"))
+
+
+class ServerUnavailable(ConnectionError):
+    """Raised without touching the network while a server's breaker is open."""
+
+    def __init__(self, retry_in: float, last_online: float = None):
+        super().__init__(retry_in, last_online)
+        self.retry_in    = retry_in
+        self.last_online = last_online
+
+    def __str__(self):
+        seen = f"last seen online <t:{int(self.last_online)}:R>" if self.last_online else "not seen online yet"
+        return f"Server is unreachable ({seen}); retrying in {max(1, round(self.retry_in))}s."
+
+
+class _Circuit:
+    __slots__ = ("failures", "open_until", "cooldown", "probing", "last_online")
+
+    def __init__(self):
+        self.failures    = 0
+        self.open_until  = 0.0    # monotonic; 0 = closed
+        self.cooldown    = BREAKER_COOLDOWN
+        self.probing     = False
+        self.last_online = None   # wall clock of the last successful call
+
+
+class CircuitBreakers:
+    """Per-(ip, port) circuit breakers.
+
+    After `threshold` consecutive failures a server's circuit opens and calls
+    fail instantly with ServerUnavailable. Once the cooldown passes, one call
+    is let through as a half-open probe: success closes the circuit, failure
+    reopens it with the cooldown doubled (up to `max_cooldown`).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_types=(OSError,),
+        threshold: int = BREAKER_THRESHOLD,
+        cooldown: float = BREAKER_COOLDOWN,
+        max_cooldown: float = BREAKER_MAX_COOLDOWN,
+    ):
+        self.name          = name
+        self.failure_types = failure_types
+        self.threshold     = threshold
+        self.cooldown      = cooldown
+        self.max_cooldown  = max_cooldown
+        self._circuits     = {}   # (ip, port) -> _Circuit
+
+    def _circuit(self, key) -> _Circuit:
+        c = self._circuits.get(key)
+        if c is None:
+            c = self._circuits[key] = _Circuit()
+            c.cooldown = self.cooldown
+        return c
+
+    def check(self, key, claim_probe: bool = True) -> bool:
+        """Raise ServerUnavailable if calls to `key` should be refused; True if this call is the probe."""
+        c = self._circuits.get(key)
+        if c is None or not c.open_until:
+            return False
+        now = time.monotonic()
+        if now < c.open_until or (c.probing and claim_probe):
+            metrics.inc("bot_breaker_rejected_total", breaker=self.name)
+            raise ServerUnavailable(max(c.open_until - now, 0.0), c.last_online)
+        if not claim_probe:
+            return False
+        c.probing = True
+        return True
+
+    def success(self, key):
+        c = self._circuit(key)
+        c.failures    = 0
+        c.open_until  = 0.0
+        c.cooldown    = self.cooldown
+        c.probing     = False
+        c.last_online = time.time()
+
+    def failure(self, key):
+        c = self._circuit(key)
+        c.failures += 1
+        if c.probing:
+            c.probing    = False
+            c.cooldown   = min(c.cooldown * 2, self.max_cooldown)
+            c.open_until = time.monotonic() + c.cooldown
+        elif c.failures >= self.threshold and not c.open_until:
+            c.open_until = time.monotonic() + c.cooldown
+            metrics.inc("bot_breaker_opened_total", breaker=self.name)
+
+    @contextmanager
+    def guard(self, key, record: bool = True):
+        """Refuse the call while open; otherwise record its outcome.
+
+        With record=False the call is only refused while the circuit is open;
+        its outcome says nothing about the server (e.g. Query may be disabled).
+        """
+        probe = self.check(key, claim_probe=record)
+        try:
+            yield
+        except (ServerBusy, asyncio.CancelledError):
+            if probe:
+                self._circuits[key].probing = False   # probe never reached the server
+            raise
+        except self.failure_types:
+            if record:
+                self.failure(key)
+            raise
+        except BaseException:
+            if probe:
+                self._circuits[key].probing = False
+            raise
+        else:
+            if record:
+                self.success(key)
+
+
+status_breakers = CircuitBreakers("status")
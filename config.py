@@ -1,7 +1,18 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from utils import save_json, SERVER_CFG_PATH
+from utils import SERVER_CFG_PATH, DEFAULT_PROFILE
+
+RESERVED_PROFILES = {"all"}   # `!mcstatus all` fans out to every profile
+
+def profile_target(raw: dict, name: str):
+    """The dict to write ip/port/password into, plus the servers dict to store back (None for the default)."""
+    if not name or name == DEFAULT_PROFILE:
+        return raw, None
+    # copied rather than mutated in place: the SQLite store only persists top-level assignments
+    servers = dict(raw.get("servers", {}))
+    servers[name] = dict(servers.get(name, {}))
+    return servers[name], servers
 
 class ConfigCog(commands.Cog):
     def __init__(self, bot):
@@ -15,17 +26,19 @@ class ConfigCog(commands.Cog):
     @commands.command(
         name="config",
         help="**Usage**\n"
-             "`!config <ip> [port] [password]` or `!config ip=<ip> port=<port> pw=<password>`\n\n"
-             "Sets server IP/port/RCON password for this server; admin only.\n\n"
+             "`!config <ip> [port] [password]` or `!config ip=<ip> port=<port> pw=<password> [name=<profile>]`\n\n"
+             "Sets server IP/port/RCON password for this server; admin only. "
+             "`name=` stores it as a named profile instead of the default server.\n\n"
              "**Example**\n"
-             "`!config mc.example.net 25565 secret`"
+             "`!config mc.example.net 25565 secret`\n"
+             "`!config name=lobby ip=lobby.example.net`"
     )
     async def config(self, ctx, *args):
         cfgs = ctx.bot.server_configs
         guild_id = str(ctx.guild.id)
         raw = cfgs.setdefault(guild_id, {})
 
-        ip = port = pw = None
+        ip = port = pw = name = None
         pos = []
         for a in args:
             if "=" in a:
@@ -40,6 +53,8 @@ class ConfigCog(commands.Cog):
                         return await ctx.send("❌ `port` must be a number.")
                 elif key in ("pw", "password", "rcon"):
                     pw = v
+                elif key in ("name", "profile"):
+                    name = v.lower()
                 else:
                     return await ctx.send(f"❌ Unknown parameter `{k}`.")
             else:
@@ -60,18 +75,24 @@ class ConfigCog(commands.Cog):
 
         if not ip:
             return await ctx.send("❌ You must specify at least an IP.")
+        if name in RESERVED_PROFILES:
+            return await ctx.send(f"❌ `{name}` can't be used as a profile name.")
 
-        raw["ip"] = ip
+        target, servers = profile_target(raw, name)
+        target["ip"] = ip
         updates = [f"ip={ip}"]
         if port is not None:
-            raw["port"] = port
+            target["port"] = port
             updates.append(f"port={port}")
         if pw is not None:
-            raw["password"] = pw
+            target["password"] = pw
             updates.append("password=******")
+        if servers is not None:
+            raw["servers"] = servers
 
-        save_json(SERVER_CFG_PATH, cfgs)
-        await ctx.send("✅ Config updated: " + ", ".join(updates))
+        ctx.bot.store.mark_dirty(SERVER_CFG_PATH)
+        label = f" (`{name}`)" if servers is not None else ""
+        await ctx.send(f"✅ Config updated{label}: " + ", ".join(updates))
 
 
     @commands.has_permissions(administrator=True)
@@ -96,7 +117,7 @@ class ConfigCog(commands.Cog):
         cfgs = ctx.bot.server_configs
         raw = cfgs.setdefault(str(ctx.guild.id), {})
         raw["prefix"] = new_prefix
-        save_json(SERVER_CFG_PATH, cfgs)
+        ctx.bot.store.mark_dirty(SERVER_CFG_PATH)
         await ctx.send(f"✅ Prefix set to `{new_prefix}`")
 
 
@@ -111,33 +132,44 @@ class ConfigCog(commands.Cog):
     @app_commands.describe(
         ip="Minecraft server IP or hostname",
         port="Minecraft server port (default 25565)",
-        password="RCON password (optional)"
+        password="RCON password (optional)",
+        name="Profile name for an additional server (optional; default server if omitted)"
     )
     @app_commands.checks.has_permissions(administrator=True)
     async def config_slash(
         self,
         interaction: discord.Interaction,
         ip: str,
-        port: int = 25565,
-        password: str = None
+        port: int = None,
+        password: str = None,
+        name: str = None
     ):
         guild_id = str(interaction.guild_id)
         cfgs = self.bot.server_configs
         raw = cfgs.setdefault(guild_id, {})
-
-        raw["ip"] = ip
+        name = name.lower() if name else None
+        if name in RESERVED_PROFILES:
+            return await interaction.response.send_message(
+                f"❌ `{name}` can't be used as a profile name.", ephemeral=True
+            )
+
+        target, servers = profile_target(raw, name)
+        target["ip"] = ip
         updates = [f"ip={ip}"]
 
-        if port != 25565:
-            raw["port"] = port
+        if port is not None:
+            target["port"] = port
             updates.append(f"port={port}")
         if password is not None:
-            raw["password"] = password
+            target["password"] = password
             updates.append("password=******")
+        if servers is not None:
+            raw["servers"] = servers
 
-        save_json(SERVER_CFG_PATH, cfgs)
+        self.bot.store.mark_dirty(SERVER_CFG_PATH)
+        label = f" (`{name}`)" if servers is not None else ""
         await interaction.response.send_message(
-            content="✅ Config updated: " + ", ".join(updates),
+            content=f"✅ Config updated{label}: " + ", ".join(updates),
             ephemeral=True
         )
 
@@ -155,7 +187,7 @@ class ConfigCog(commands.Cog):
         self,
         interaction: discord.Interaction,
         ip: str,
-        port: int = 25565,
+        port: int = None,
         password: str = None
     ):
         await self.config_slash.callback(
@@ -179,7 +211,7 @@ class ConfigCog(commands.Cog):
         cfgs = self.bot.server_configs
         raw = cfgs.setdefault(guild_id, {})
         raw["prefix"] = new_prefix
-        save_json(SERVER_CFG_PATH, cfgs)
+        self.bot.store.mark_dirty(SERVER_CFG_PATH)
         await interaction.response.send_message(
             content=f"✅ Prefix set to `{new_prefix}`",
             ephemeral=True
@@ -4,15 +4,17 @@ from discord import app_commands
 
 RCON_COMMANDS = {
     "mctime", "mcseed", "mcstop",
-    "mcobjs", "mcstat", "mcleaderboard",
+    "mcobjs", "mcstat", "mcstats", "mcleaderboard", "mctrack",
 }
 
 CATEGORIES = {
-    "📍 Server Waypoints":    ["waypointadd", "waypointremove", "waypoints", "waypointinfo"],
-    "⚙️ Configuration":       ["config", "setserverinfo", "prefix"],
-    "🖥️ Server Info":         ["mcstatus", "mcplayers", "mcinfo", "mcping"],
+    "📍 Server Waypoints":    ["waypointadd", "waypointremove", "waypoints", "waypointinfo",
+                              "waypointnear", "waypointsin", "waypointimport", "waypointexport"],
+    "⚙️ Configuration":       ["config", "setserverinfo", "prefix", "botstats"],
+    "🖥️ Server Info":         ["mcstatus", "network", "mcplayers", "mcinfo", "mcping"],
     "🔌 RCON":                ["mctime", "mcseed", "mcstop"],
-    "📊 Stats":               ["mcobjs", "mcstat", "mcleaderboard"],
+    "📊 Stats":               ["mcobjs", "mcstat", "mcstats", "mcleaderboard",
+                              "mctrack", "mcuntrack", "mcplaytime", "mcplaytop"],
 }
 
 #
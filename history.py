@@ -0,0 +1,150 @@
+import base64
+import bisect
+import json
+import os
+import re
+import time
+from array import array
+from operator import sub
+
+from utils import write_atomic
+
+HISTORY_PATH      = os.getenv("HISTORY_PATH", "score_history.json")
+HISTORY_INTERVAL  = float(os.getenv("SCORE_HISTORY_INTERVAL", "3600"))
+HISTORY_RETENTION = float(os.getenv("SCORE_HISTORY_RETENTION", str(35 * 86400)))
+
+DURATION = re.compile(r"(\d+)([smhdw])")
+UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def parse_duration(text: str):
+    """'7d', '12h', '1w2d' -> seconds, or None if it isn't a duration."""
+    text = text.strip().lower()
+    total, pos = 0, 0
+    for m in DURATION.finditer(text):
+        if m.start() != pos:
+            return None
+        total += int(m.group(1)) * UNITS[m.group(2)]
+        pos = m.end()
+    return total if pos == len(text) and total > 0 else None
+
+
+def _pack(a) -> str:
+    return base64.b64encode(a.tobytes() if isinstance(a, array) else bytes(a)).decode()
+
+def _unpack(typecode: str, text: str) -> array:
+    a = array(typecode)
+    a.frombytes(base64.b64decode(text))
+    return a
+
+
+class ObjectiveHistory:
+    """Columnar snapshots of one objective.
+
+    Player names are interned to dense ids; each snapshot is an array('q') of
+    scores indexed by id plus a presence bytearray, so a delta between two
+    snapshots is one element-wise subtraction of two columns.
+    """
+
+    def __init__(self):
+        self.names    = []            # id -> player name
+        self.ids      = {}            # player name -> id
+        self.times    = array("d")    # snapshot timestamps, ascending
+        self.scores   = []            # array('q') per snapshot
+        self.present  = []            # bytearray per snapshot
+
+    def _intern(self, name: str) -> int:
+        pid = self.ids.get(name)
+        if pid is None:
+            pid = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return pid
+
+    def record(self, ts: float, entries):
+        entries = [(self._intern(name), score) for name, score in entries]
+        col  = array("q", bytes(8 * len(self.names)))
+        mask = bytearray(len(self.names))
+        for pid, score in entries:
+            col[pid]  = score
+            mask[pid] = 1
+        self.times.append(ts)
+        self.scores.append(col)
+        self.present.append(mask)
+
+    def prune(self, before: float):
+        cut = bisect.bisect_left(self.times, before)
+        if cut:
+            del self.times[:cut]
+            del self.scores[:cut]
+            del self.present[:cut]
+
+    def deltas(self, since: float):
+        """(seconds covered, [(name, gain), ...]) for players in the latest snapshot, against the
+        last snapshot taken at or before `since` (the oldest one if history starts later);
+        None if there aren't two snapshots to compare."""
+        i = max(bisect.bisect_right(self.times, since) - 1, 0)
+        if i >= len(self.times) - 1:
+            return None
+        new, mask = self.scores[-1], self.present[-1]
+        old = self.scores[i]
+        if len(old) < len(new):
+            old = old + array("q", bytes(8 * (len(new) - len(old))))
+        names = self.names
+        return self.times[-1] - self.times[i], [(names[pid], d) for pid, d in enumerate(map(sub, new, old)) if mask[pid]]
+
+    def to_json(self) -> dict:
+        return {
+            "names":   self.names,
+            "times":   _pack(self.times),
+            "scores":  [_pack(c) for c in self.scores],
+            "present": [_pack(m) for m in self.present],
+        }
+
+    @classmethod
+    def from_json(cls, data: dict):
+        h = cls()
+        h.names   = data["names"]
+        h.ids     = {n: i for i, n in enumerate(h.names)}
+        h.times   = _unpack("d", data["times"])
+        h.scores  = [_unpack("q", c) for c in data["scores"]]
+        h.present = [bytearray(base64.b64decode(m)) for m in data["present"]]
+        return h
+
+
+class ScoreHistory:
+    """guild_id -> objective -> ObjectiveHistory, persisted to one JSON file."""
+
+    def __init__(self, path: str = HISTORY_PATH, retention: float = HISTORY_RETENTION):
+        self.path = path
+        self.retention = retention
+        self.guilds = {}
+
+    @classmethod
+    def load(cls, path: str = HISTORY_PATH, retention: float = HISTORY_RETENTION):
+        h = cls(path, retention)
+        if os.path.exists(path):
+            with open(path) as f:
+                raw = json.load(f)
+            h.guilds = {
+                g: {obj: ObjectiveHistory.from_json(d) for obj, d in objs.items()}
+                for g, objs in raw.items()
+            }
+        return h
+
+    def get(self, guild_id: str, objective: str):
+        return self.guilds.get(guild_id, {}).get(objective)
+
+    def record(self, guild_id: str, objective: str, entries, ts: float = None):
+        ts = time.time() if ts is None else ts
+        h = self.guilds.setdefault(guild_id, {}).setdefault(objective, ObjectiveHistory())
+        h.record(ts, entries)
+        h.prune(ts - self.retention)
+
+    def dumps(self) -> str:
+        return json.dumps({
+            g: {obj: h.to_json() for obj, h in objs.items()}
+            for g, objs in self.guilds.items()
+        })
+
+    def save(self, text: str = None):
+        write_atomic(self.path, self.dumps() if text is None else text)
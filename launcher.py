@@ -0,0 +1,106 @@
+"""Run the bot as several processes, each owning a contiguous range of shards.
+
+    python launcher.py --processes 4 [--shards 16 | --shards auto] [bot.py args...]
+
+Workers share state through the SQLite store (STORAGE_BACKEND=sqlite is forced);
+a worker that exits with an error is restarted after a short backoff.
+"""
+import argparse
+import asyncio
+import os
+import signal
+import sys
+
+import aiohttp
+from dotenv import load_dotenv
+
+from sharding import shard_ranges
+
+IDENTIFY_DELAY  = 5.0    # Discord allows one IDENTIFY per 5 s per concurrency bucket
+RESTART_BACKOFF = (5, 10, 30, 60, 300)
+GATEWAY_URL     = "https://discord.com/api/v10/gateway/bot"
+
+
+async def recommended_shards(token: str):
+    async with aiohttp.ClientSession() as session:
+        async with session.get(GATEWAY_URL, headers={"Authorization": f"Bot {token}"}) as resp:
+            resp.raise_for_status()
+            data = await resp.json()
+    return data["shards"], data["session_start_limit"]["max_concurrency"]
+
+
+def worker_env(index: int, shards: range, shard_count: int) -> dict:
+    env = dict(os.environ)
+    env["SHARD_COUNT"] = str(shard_count)
+    env["SHARD_IDS"] = f"{shards.start}-{shards.stop - 1}"
+    env["STORAGE_BACKEND"] = "sqlite"
+    # per-process files and ports; everything per-guild lives in SQLite
+    env["HISTORY_PATH"]  = f"score_history.shards-{shards.start}-{shards.stop - 1}.json"
+    env["SESSIONS_PATH"] = f"sessions.shards-{shards.start}-{shards.stop - 1}.jsonl"
+    if env.get("METRICS_PORT"):
+        env["METRICS_PORT"] = str(int(env["METRICS_PORT"]) + index)
+    return env
+
+
+async def supervise(index: int, shards: range, shard_count: int, bot_args, delay: float, stopping: asyncio.Event):
+    await asyncio.sleep(delay)
+    failures = 0
+    while not stopping.is_set():
+        label = f"[shards {shards.start}-{shards.stop - 1}]"
+        proc = await asyncio.create_subprocess_exec(
+            sys.executable, "bot.py", *bot_args, env=worker_env(index, shards, shard_count)
+        )
+        print(f"{label} started pid {proc.pid}")
+        waiter = asyncio.create_task(proc.wait())
+        stop = asyncio.create_task(stopping.wait())
+        await asyncio.wait((waiter, stop), return_when=asyncio.FIRST_COMPLETED)
+        if stopping.is_set():
+            if proc.returncode is None:
+                proc.send_signal(signal.SIGINT)
+            await waiter
+            return
+        stop.cancel()
+        code = proc.returncode
+        if code == 0:
+            print(f"{label} exited cleanly")
+            return
+        delay = RESTART_BACKOFF[min(failures, len(RESTART_BACKOFF) - 1)]
+        failures += 1
+        print(f"{label} exited with {code}; restarting in {delay}s")
+        try:
+            await asyncio.wait_for(stopping.wait(), delay)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--shards", default=os.getenv("SHARD_COUNT", "auto"),
+                        help="total shard count, or 'auto' for Discord's recommendation")
+    args, bot_args = parser.parse_known_args()
+
+    concurrency = 1
+    if args.shards == "auto":
+        shard_count, concurrency = await recommended_shards(os.getenv("DISCORD_TOKEN"))
+    else:
+        shard_count = int(args.shards)
+    ranges = shard_ranges(shard_count, args.processes)
+    print(f"{shard_count} shards over {len(ranges)} processes")
+
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopping.set)
+
+    # stagger start-up so workers don't race each other's IDENTIFY rate limit
+    delay, tasks = 0.0, []
+    for i, shards in enumerate(ranges):
+        tasks.append(asyncio.create_task(supervise(i, shards, shard_count, bot_args, delay, stopping)))
+        delay += IDENTIFY_DELAY * len(shards) / concurrency
+    await asyncio.gather(*tasks)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,96 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+from metrics import metrics, run_blocking
+
+STATUS_WORKERS    = int(os.getenv("MC_STATUS_WORKERS", "16"))
+STATUS_PER_SERVER = int(os.getenv("MC_STATUS_PER_SERVER", "2"))
+STATUS_MAX_QUEUED = int(os.getenv("MC_STATUS_MAX_QUEUED", "8"))
+RCON_PER_SERVER   = int(os.getenv("RCON_INFLIGHT_PER_SERVER", "8"))
+RCON_MAX_QUEUED   = int(os.getenv("RCON_MAX_QUEUED", "32"))
+
+
+class ServerBusy(Exception):
+    """Raised instead of queueing when a server already has too many calls waiting."""
+
+    def __str__(self):
+        return "Server is busy, try again in a moment."
+
+
+class _Slot:
+    __slots__ = ("sem", "waiting", "active")
+
+    def __init__(self, limit: int):
+        self.sem = asyncio.Semaphore(limit)
+        self.waiting = 0
+        self.active = 0
+
+
+class ServerLimiter:
+    """Per-(ip, port) concurrency cap with a bounded wait queue.
+
+    At most `limit` calls run against one server at a time; once `max_queued`
+    more are waiting, further calls fail fast with ServerBusy.
+    """
+
+    def __init__(self, name: str, limit: int, max_queued: int):
+        self.name = name
+        self.limit = limit
+        self.max_queued = max_queued
+        self._slots = {}   # (ip, port) -> _Slot
+
+    @asynccontextmanager
+    async def slot(self, key):
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = self._slots[key] = _Slot(self.limit)
+        if slot.sem.locked() and slot.waiting >= self.max_queued:
+            metrics.inc("bot_server_busy_total", pool=self.name)
+            raise ServerBusy()
+        slot.waiting += 1
+        start = time.perf_counter()
+        try:
+            await slot.sem.acquire()
+        except BaseException:
+            slot.waiting -= 1
+            self._discard(key, slot)
+            raise
+        slot.waiting -= 1
+        slot.active += 1
+        metrics.observe("bot_server_queue_wait_seconds", time.perf_counter() - start, pool=self.name)
+        try:
+            yield
+        finally:
+            slot.active -= 1
+            slot.sem.release()
+            self._discard(key, slot)
+
+    def _discard(self, key, slot: _Slot):
+        # only drop the slot once nobody holds or waits on it; a fresh one would reset the cap
+        if not slot.active and not slot.waiting and self._slots.get(key) is slot:
+            del self._slots[key]
+
+
+# status/query/ping sockets block a thread for the whole connect timeout, so
+# they get their own pool instead of starving the loop's default executor
+status_executor = ThreadPoolExecutor(STATUS_WORKERS, thread_name_prefix="mc-status")
+status_limiter  = ServerLimiter("status", STATUS_PER_SERVER, STATUS_MAX_QUEUED)
+rcon_limiter    = ServerLimiter("rcon", RCON_PER_SERVER, RCON_MAX_QUEUED)
+
+
+async def run_status(op: str, key, fn, *args):
+    """Run a blocking mcstatus call for server `key` on the status pool under its per-server limit."""
+    async with status_limiter.slot(key):
+        call = asyncio.ensure_future(run_blocking(op, fn, *args, executor=status_executor))
+        try:
+            return await asyncio.shield(call)
+        except asyncio.CancelledError:
+            # the thread can't be stopped, so the slot stays taken until it returns;
+            # releasing it now would let a hedged or timed-out caller exceed the cap
+            await asyncio.wait({call})
+            if not call.cancelled():
+                call.exception()
+            raise
@@ -0,0 +1,241 @@
+import asyncio
+import bisect
+import os
+import time
+from collections import defaultdict
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = os.getenv("METRICS_PORT")   # unset = no HTTP endpoint
+
+# seconds; fixed buckets keep observe() to one bisect and an increment
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    __slots__ = ("counts", "sum", "count", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)   # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "Histogram"):
+        for i, c in enumerate(other.counts):
+            self.counts[i] += c
+        self.sum += other.sum
+        self.count += other.count
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        """Bucket-interpolated estimate of the q-quantile."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            if c and seen + c >= rank:
+                lo = BUCKETS[i - 1] if i else 0.0
+                hi = BUCKETS[i] if i < len(BUCKETS) else self.max
+                return lo + (hi - lo) * (rank - seen) / c
+            seen += c
+        return self.max
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Metrics:
+    """In-process histograms and counters keyed by metric name and label set."""
+
+    def __init__(self):
+        self.histograms = defaultdict(Histogram)   # (name, labels) -> Histogram
+        self.counters   = defaultdict(int)         # (name, labels) -> int
+        self.started_at = time.time()
+
+    @staticmethod
+    def _key(name: str, labels: dict):
+        return name, tuple(sorted(labels.items()))
+
+    def observe(self, name: str, value: float, **labels):
+        self.histograms[self._key(name, labels)].observe(value)
+
+    def inc(self, name: str, amount: int = 1, **labels):
+        self.counters[self._key(name, labels)] += amount
+
+    def merged(self, name: str, by: str):
+        """Histograms of `name` merged across every label except `by`."""
+        out = defaultdict(Histogram)
+        for (n, labels), h in list(self.histograms.items()):
+            if n == name:
+                out[dict(labels).get(by)].merge(h)
+        return out
+
+    def total(self, name: str, by: str = None):
+        out = defaultdict(int)
+        for (n, labels), v in list(self.counters.items()):
+            if n == name:
+                out[dict(labels).get(by) if by else None] += v
+        return out
+
+    def render_prometheus(self) -> str:
+        def fmt(labels, extra=()):
+            pairs = [*labels, *extra]
+            if not pairs:
+                return ""
+            return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+        lines = []
+        typed = set()
+        for (name, labels), h in sorted(self.histograms.items()):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} histogram")
+            cumulative = 0
+            for bound, c in zip((*BUCKETS, "+Inf"), h.counts):
+                cumulative += c
+                lines.append(f"{name}_bucket{fmt(labels, [('le', bound)])} {cumulative}")
+            lines.append(f"{name}_sum{fmt(labels)} {h.sum}")
+            lines.append(f"{name}_count{fmt(labels)} {h.count}")
+        for (name, labels), v in sorted(self.counters.items()):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name}{fmt(labels)} {v}")
+        return "\n".join(lines) + "\n"
+
+metrics = Metrics()
+
+
+def observe_command(name: str, kind: str, guild_id, seconds: float, failed: bool):
+    guild = str(guild_id) if guild_id else "dm"
+    metrics.observe("bot_command_seconds", seconds, command=name, kind=kind, guild=guild)
+    if failed:
+        metrics.inc("bot_command_errors_total", command=name, kind=kind, guild=guild)
+
+
+class TimedCommandTree(app_commands.CommandTree):
+    """CommandTree that times every slash command from dispatch to completion or error."""
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        interaction.extras["started_at"] = time.perf_counter()
+        return True
+
+    def observe(self, interaction: discord.Interaction, failed: bool):
+        start = interaction.extras.get("started_at")
+        if start is not None and interaction.command is not None:
+            observe_command(interaction.command.qualified_name, "slash", interaction.guild_id,
+                            time.perf_counter() - start, failed)
+
+    async def on_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        self.observe(interaction, failed=True)
+        await super().on_error(interaction, error)
+
+
+class track:
+    """`with track("rcon"):` records bot_<op>_seconds and counts bot_<op>_errors_total."""
+
+    __slots__ = ("op", "start")
+
+    def __init__(self, op: str):
+        self.op = op
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        metrics.observe(f"bot_{self.op}_seconds", time.perf_counter() - self.start)
+        if exc_type is not None and not issubclass(exc_type, asyncio.CancelledError):
+            metrics.inc(f"bot_{self.op}_errors_total")
+        return False
+
+
+async def run_blocking(op: str, fn, *args, executor=None):
+    """run_in_executor with executor queue wait and call time recorded under `op`."""
+    submitted = time.perf_counter()
+
+    def call():
+        metrics.observe("bot_executor_wait_seconds", time.perf_counter() - submitted, op=op)
+        return fn(*args)
+
+    with track(op):
+        return await asyncio.get_running_loop().run_in_executor(executor, call)
+
+
+async def start_http(host: str, port: int):
+    from aiohttp import web   # ships with discord.py
+
+    async def handle(request):
+        return web.Response(text=metrics.render_prometheus(), content_type="text/plain", charset="utf-8")
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+class MetricsCog(commands.Cog):
+    """Admin view of command latency and RCON/status health."""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    def _stats_embed(self) -> discord.Embed:
+        uptime = int(time.time() - metrics.started_at)
+        embed = discord.Embed(title="📈 Bot stats", color=0x00ff00)
+        per_cmd = metrics.merged("bot_command_seconds", by="command")
+        errors = metrics.total("bot_command_errors_total", by="command")
+        lines = []
+        for name, h in sorted(per_cmd.items(), key=lambda kv: kv[1].count, reverse=True)[:15]:
+            lines.append(
+                f"`{name}` ×{h.count} • p50 {h.quantile(0.5) * 1000:.0f} ms"
+                f" • p95 {h.quantile(0.95) * 1000:.0f} ms • err {errors.get(name, 0)}"
+            )
+        embed.add_field(name="Commands", value="\n".join(lines) or "No commands yet.", inline=False)
+        for op, label in (("rcon", "RCON"), ("status", "Status pings")):
+            h = metrics.merged(f"bot_{op}_seconds", by=None).get(None)
+            if h and h.count:
+                err = metrics.total(f"bot_{op}_errors_total").get(None, 0)
+                embed.add_field(
+                    name=label,
+                    value=f"×{h.count} • p50 {h.quantile(0.5) * 1000:.0f} ms • p95 "
+                          f"{h.quantile(0.95) * 1000:.0f} ms • err {err}",
+                    inline=False
+                )
+        embed.set_footer(text=f"Uptime {uptime // 3600}h {uptime % 3600 // 60}m")
+        return embed
+
+    @commands.has_permissions(administrator=True)
+    @commands.command(
+        name="botstats",
+        help="**Usage**\n"
+             "`!botstats`\n\n"
+             "Shows per-command latency and RCON/status error counts; admin only.\n\n"
+             "**Example**\n"
+             "`!botstats`"
+    )
+    async def botstats(self, ctx: commands.Context):
+        await ctx.send(embed=self._stats_embed())
+
+    @app_commands.command(
+        name="botstats",
+        description="Shows per-command latency and RCON/status error counts; admin only."
+    )
+    @app_commands.checks.has_permissions(administrator=True)
+    async def botstats_slash(self, interaction: discord.Interaction):
+        await interaction.response.send_message(embed=self._stats_embed(), ephemeral=True)
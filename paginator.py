@@ -0,0 +1,82 @@
+import discord
+from discord.ui import View, Modal, TextInput, button
+
+
+class JumpModal(Modal, title="Jump to page"):
+    page = TextInput(label="Page number", max_length=7)
+
+    def __init__(self, paginator):
+        super().__init__()
+        self.paginator = paginator
+        self.page.placeholder = f"1-{paginator.page_count}"
+
+    async def on_submit(self, interaction: discord.Interaction):
+        try:
+            index = int(self.page.value) - 1
+        except ValueError:
+            return await interaction.response.send_message("❌ Page must be a number.", ephemeral=True)
+        await self.paginator.show(interaction, index)
+
+
+class LazyPaginator(View):
+    """Author-only page navigation that renders each embed only when it's shown.
+
+    Subclasses implement render(index) -> discord.Embed.
+    """
+
+    def __init__(self, page_count: int, author, timeout: float = 120):
+        super().__init__(timeout=timeout)
+        self.page_count = max(1, page_count)
+        self.current = 0
+        self.author = author
+        self.message = None
+
+    def render(self, index: int) -> discord.Embed:
+        raise NotImplementedError
+
+    def _sync_buttons(self):
+        at_start, at_end = self.current == 0, self.current >= self.page_count - 1
+        self.first_button.disabled = self.prev_button.disabled = at_start
+        self.next_button.disabled = self.last_button.disabled = at_end
+        self.jump_button.disabled = self.page_count == 1
+
+    def first_page(self) -> discord.Embed:
+        self._sync_buttons()
+        return self.render(0)
+
+    async def show(self, interaction: discord.Interaction, index: int):
+        self.current = max(0, min(index, self.page_count - 1))
+        self._sync_buttons()
+        await interaction.response.edit_message(embed=self.render(self.current), view=self)
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user != self.author:
+            await interaction.response.send_message("Only the author can navigate.", ephemeral=True)
+            return False
+        return True
+
+    async def on_timeout(self):
+        for b in self.children:
+            b.disabled = True
+        if self.message is not None:
+            await self.message.edit(view=self)
+
+    @button(label="⏮", style=discord.ButtonStyle.secondary)
+    async def first_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.show(interaction, 0)
+
+    @button(label="◀️ Prev", style=discord.ButtonStyle.secondary)
+    async def prev_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.show(interaction, self.current - 1)
+
+    @button(label="Next ▶️", style=discord.ButtonStyle.secondary)
+    async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.show(interaction, self.current + 1)
+
+    @button(label="⏭", style=discord.ButtonStyle.secondary)
+    async def last_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.show(interaction, self.page_count - 1)
+
+    @button(label="Go to…", style=discord.ButtonStyle.primary)
+    async def jump_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await interaction.response.send_modal(JumpModal(self))
@@ -0,0 +1,78 @@
+import asyncio
+import json
+import os
+from collections.abc import Mapping
+
+from utils import write_atomic
+
+SAVE_INTERVAL = float(os.getenv("SAVE_INTERVAL", "5"))
+
+
+def _encode(obj):
+    """json.dumps fallback: mapping types such as WaypointTable are written as plain objects."""
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class WriteBehindStore:
+    """Coalesces JSON saves: mutations mark a file dirty and a background task
+    writes each dirty file at most once per interval, off the event loop."""
+
+    def __init__(self, sources: dict, interval: float = SAVE_INTERVAL):
+        self.sources  = sources   # path -> callable returning the data to save
+        self.interval = interval
+        self._dirty   = set()
+        self._lock    = asyncio.Lock()
+        self._task    = None
+
+    def mark_dirty(self, path: str):
+        self._dirty.add(path)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except OSError as e:
+                print(f"Failed to save data: {e}")
+
+    async def flush(self):
+        async with self._lock:
+            remaining = list(self._dirty)
+            self._dirty = set()
+            try:
+                while remaining:
+                    # serialize on the loop so the snapshot is consistent, write in a thread
+                    text = json.dumps(self.sources[remaining[0]](), indent=4, default=_encode)
+                    await asyncio.to_thread(write_atomic, remaining[0], text)
+                    remaining.pop(0)
+            except BaseException:
+                # a failed (or cancelled) write keeps this and every unwritten path dirty
+                self._dirty |= set(remaining)
+                raise
+
+    def flush_sync(self):
+        remaining = list(self._dirty)
+        self._dirty = set()
+        try:
+            while remaining:
+                write_atomic(remaining[0], json.dumps(self.sources[remaining[0]](), indent=4, default=_encode))
+                remaining.pop(0)
+        except BaseException:
+            self._dirty |= set(remaining)
+            raise
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
@@ -0,0 +1,114 @@
+import asyncio
+import os
+import time
+from collections import namedtuple
+
+from mcstatus import JavaServer
+
+from breaker import ServerUnavailable, status_breakers
+from limits import ServerBusy, run_status
+from status_cache import status_cache
+
+# how long to trust a remembered protocol before hedging again
+PREFER_TTL  = float(os.getenv("MC_PLAYERS_PREFER_TTL", "600"))
+# once a partial status sample is in, how much longer Query gets to answer
+QUERY_GRACE = float(os.getenv("MC_PLAYERS_QUERY_GRACE", "1.5"))
+
+Players = namedtuple("Players", "names online max complete")
+
+
+class PlayerLookup:
+    """Online player list from Query and Status raced against each other.
+
+    The first complete list wins and the other request is cancelled. Status
+    only carries a sample (servers usually cap it at 12 names), so a partial
+    sample is held back until Query answers or fails. Which protocol works is
+    remembered per server, so later lookups skip the race.
+    """
+
+    def __init__(self, prefer_ttl: float = PREFER_TTL, query_grace: float = QUERY_GRACE):
+        self.prefer_ttl  = prefer_ttl
+        self.query_grace = query_grace
+        self._prefer = {}   # (ip, port) -> ("query" | "status", expires_at)
+
+    def preferred(self, key):
+        hit = self._prefer.get(key)
+        if hit is None or hit[1] < time.monotonic():
+            return None
+        return hit[0]
+
+    def _remember(self, key, protocol: str):
+        self._prefer[key] = (protocol, time.monotonic() + self.prefer_ttl)
+
+    @staticmethod
+    async def _query(key) -> Players:
+        with status_breakers.guard(key, record=False):
+            q = await run_status("query", key, JavaServer(*key).query)
+        # mcstatus >= 12 renamed players.names to players.list
+        names = getattr(q.players, "list", None) or getattr(q.players, "names", None) or []
+        return Players(list(names), q.players.online, q.players.max, True)
+
+    @staticmethod
+    async def _status(status, key) -> Players:
+        st = await status(*key)
+        names = [p.name for p in st.players.sample or []]
+        return Players(names, st.players.online, st.players.max, len(names) >= st.players.online)
+
+    async def players(self, ip: str, port: int, status=None) -> Players:
+        """`status` is an async (ip, port) -> status callable; defaults to the shared status cache."""
+        status = status or status_cache.status
+        key = (ip, port)
+        prefer = self.preferred(key)
+        if prefer == "query":
+            try:
+                return await self._query(key)
+            except (ServerBusy, ServerUnavailable):
+                raise
+            except Exception:
+                self._prefer.pop(key, None)   # stopped answering; race again
+        elif prefer == "status":
+            return await self._status(status, key)
+        return await self._hedge(key, status)
+
+    async def _hedge(self, key, status) -> Players:
+        query_task  = asyncio.create_task(self._query(key))
+        status_task = asyncio.create_task(self._status(status, key))
+        partial = None
+        query_failed = False   # remember "status" only once status has actually answered
+        try:
+            pending = {query_task, status_task}
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=self.query_grace if partial is not None else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    self._remember(key, "status")   # Query too slow to be worth waiting for
+                    return partial
+                for task in done:
+                    err = task.exception()
+                    if task is query_task:
+                        if err is None:
+                            self._remember(key, "query")
+                            return task.result()
+                        # Query disabled or firewalled
+                        query_failed = not isinstance(err, (ServerBusy, ServerUnavailable))
+                    elif err is None:
+                        if task.result().complete:
+                            if query_failed:
+                                self._remember(key, "status")
+                            return task.result()
+                        partial = task.result()
+            if partial is not None:
+                if query_failed:
+                    self._remember(key, "status")
+                return partial
+            # both failed; status errors say more about the server than Query's
+            raise status_task.exception()
+        finally:
+            for task in (query_task, status_task):
+                if not task.done():
+                    task.cancel()
+
+player_lookup = PlayerLookup()
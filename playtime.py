@@ -0,0 +1,140 @@
+import asyncio
+import discord
+from discord import app_commands
+from discord.ext import commands, tasks
+
+from limits import ServerBusy
+from player_lookup import player_lookup
+from sessions import SessionTracker, SESSION_INTERVAL, format_duration
+from sharding import owns_guild
+from stats import LeaderboardPaginator, MAX_LEADERBOARD
+from utils import server_profiles
+
+
+async def online_players(ip: str, port: int):
+    """Full online player set, or None when only a truncated status sample is available."""
+    pl = await player_lookup.players(ip, port)
+    return set(pl.names) if pl.complete else None
+
+
+class PlaytimeCog(commands.Cog):
+    """Tracks player sessions in the background; prefix & slash playtime commands."""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.tracker = SessionTracker.load()
+
+    async def cog_load(self):
+        self.poll_sessions.start()
+
+    async def cog_unload(self):
+        self.poll_sessions.cancel()
+
+    def _targets(self):
+        """(ip, port) -> guild ids, so a server shared by several guilds is polled once."""
+        targets = {}
+        for guild_id in list(self.bot.server_configs):
+            if not owns_guild(guild_id):
+                continue
+            for cfg in server_profiles(self.bot, guild_id).values():
+                targets.setdefault((cfg["ip"], cfg["port"]), []).append(guild_id)
+        return targets
+
+    @tasks.loop(seconds=SESSION_INTERVAL)
+    async def poll_sessions(self):
+        targets = self._targets()
+        keys = list(targets)
+        results = await asyncio.gather(*(online_players(*k) for k in keys), return_exceptions=True)
+        seen, failed = {}, set()
+        for key, players in zip(keys, results):
+            if isinstance(players, ServerBusy):
+                players = None    # our own limiter said no: skip this poll, don't end sessions
+            elif isinstance(players, Exception):
+                players = set()   # unreachable: everyone on it has left
+            for guild_id in targets[key]:
+                if players is None:
+                    failed.add(guild_id)
+                else:
+                    seen.setdefault(guild_id, set()).update(players)
+        for guild_id, players in seen.items():
+            if guild_id not in failed:
+                self.tracker.observe(guild_id, players)
+        await asyncio.to_thread(self.tracker.append, self.tracker.drain())
+
+    def _playtime_message(self, guild_id: str, player: str) -> str:
+        hit = self.tracker.playtime(guild_id, player)
+        if hit is None:
+            return f"❌ `{player}` hasn't been seen online."
+        name, total, joined = hit
+        status = f" • 🟢 online since <t:{int(joined)}:R>" if joined is not None else ""
+        return f"⏱️ **{name}** has played {format_duration(total)}{status}"
+
+    def _playtop(self, guild_id: str, count: int, author):
+        count = max(1, min(count, MAX_LEADERBOARD))
+        rows = self.tracker.top(guild_id, count)
+        if not rows:
+            return None
+        return LeaderboardPaginator("Playtime", rows, 0, author, "Tracked playtime", fmt=format_duration)
+
+    #
+    # --- PREFIX COMMANDS ---
+    #
+
+    @commands.command(
+        name="mcplaytime",
+        help="**Usage**\n"
+             "`!mcplaytime <player>`\n\n"
+             "Shows a player's total tracked playtime on this server's Minecraft servers.\n\n"
+             "**Example**\n"
+             "`!mcplaytime Steve`"
+    )
+    async def mcplaytime(self, ctx, player: str = None):
+        if not player:
+            return await ctx.send("❌ Usage: `!mcplaytime <player>`")
+        await ctx.send(self._playtime_message(str(ctx.guild.id), player))
+
+    @commands.command(
+        name="mcplaytop",
+        help="**Usage**\n"
+             "`!mcplaytop [count]`\n\n"
+             "Shows the players with the most tracked playtime (default 10).\n\n"
+             "**Example**\n"
+             "`!mcplaytop 20`"
+    )
+    async def mcplaytop(self, ctx, count: int = 10):
+        paginator = self._playtop(str(ctx.guild.id), count, ctx.author)
+        if paginator is None:
+            return await ctx.send("No playtime tracked yet.")
+        if paginator.page_count == 1:
+            return await ctx.send(embed=paginator.render(0))
+        paginator.message = await ctx.send(embed=paginator.first_page(), view=paginator)
+
+    #
+    # --- SLASH COMMANDS ---
+    #
+
+    @app_commands.command(
+        name="mcplaytime",
+        description="Shows a player's total tracked playtime."
+    )
+    @app_commands.describe(player="Minecraft username")
+    async def mcplaytime_slash(self, interaction: discord.Interaction, player: str):
+        await interaction.response.send_message(self._playtime_message(str(interaction.guild_id), player))
+
+    @app_commands.command(
+        name="mcplaytop",
+        description="Shows the players with the most tracked playtime."
+    )
+    @app_commands.describe(count="How many players to show (default 10)")
+    async def mcplaytop_slash(self, interaction: discord.Interaction, count: int = 10):
+        paginator = self._playtop(str(interaction.guild_id), count, interaction.user)
+        if paginator is None:
+            return await interaction.response.send_message("No playtime tracked yet.")
+        if paginator.page_count == 1:
+            return await interaction.response.send_message(embed=paginator.render(0))
+        await interaction.response.send_message(embed=paginator.first_page(), view=paginator)
+        paginator.message = await interaction.original_response()
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(PlaytimeCog(bot))
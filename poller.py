@@ -0,0 +1,121 @@
+import asyncio
+import os
+import random
+import time
+
+from limits import ServerBusy
+from sharding import owns_guild
+from status_cache import status_cache
+from utils import server_profiles
+
+STATUS_POLL_ENABLED  = os.getenv("MC_STATUS_POLL", "0").lower() in ("1", "true", "yes")
+POLL_INTERVAL        = float(os.getenv("MC_POLL_INTERVAL", "30"))
+POLL_CONCURRENCY     = int(os.getenv("MC_POLL_CONCURRENCY", "8"))
+POLL_MAX_BACKOFF     = float(os.getenv("MC_POLL_MAX_BACKOFF", "600"))
+POLL_IDLE_FACTOR     = 2    # servers with nobody online are polled half as often
+
+MISSING = object()
+
+
+class StatusPoller:
+    """Background task that keeps a status snapshot warm for every configured server."""
+
+    def __init__(
+        self,
+        bot,
+        interval: float = POLL_INTERVAL,
+        concurrency: int = POLL_CONCURRENCY,
+        max_backoff: float = POLL_MAX_BACKOFF,
+    ):
+        self.bot         = bot
+        self.interval    = interval
+        self.max_backoff = max_backoff
+        self.snapshot    = {}   # (ip, port) -> (valid_until, status or None if offline)
+        self._next_poll  = {}   # (ip, port) -> monotonic time of the next poll
+        self._failures   = {}   # (ip, port) -> consecutive failed polls
+        self._sem        = asyncio.Semaphore(concurrency)
+        self._task       = None
+        self._polls      = set()   # polls in flight
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        polls, self._polls = list(self._polls), set()
+        for task in polls:
+            task.cancel()
+        await asyncio.gather(*polls, return_exceptions=True)
+
+    def lookup(self, ip: str, port: int):
+        """Return the last polled status (None if offline) or MISSING if it's stale."""
+        hit = self.snapshot.get((ip, port))
+        if hit is None or hit[0] < time.monotonic():
+            return MISSING
+        return hit[1]
+
+    def targets(self):
+        keys = set()
+        for guild_id in list(self.bot.server_configs):
+            if not owns_guild(guild_id):
+                continue
+            for cfg in server_profiles(self.bot, guild_id).values():
+                if cfg["ip"]:
+                    keys.add((cfg["ip"], cfg["port"]))
+        return keys
+
+    def _delay(self, key, st) -> float:
+        failures = self._failures.get(key, 0)
+        if failures:
+            return min(self.interval * 2 ** failures, self.max_backoff)
+        if st is not None and st.players.online == 0:
+            return min(self.interval * POLL_IDLE_FACTOR, self.max_backoff)
+        return self.interval
+
+    async def _poll(self, key):
+        async with self._sem:
+            try:
+                st = await asyncio.wait_for(status_cache.status(*key), self.interval)
+                self._failures.pop(key, None)
+            except ServerBusy:
+                return   # commands are already hammering it; try again next interval
+            except Exception:
+                st = None
+                self._failures[key] = self._failures.get(key, 0) + 1
+        delay = self._delay(key, st)
+        now = time.monotonic()
+        self._next_poll[key] = now + delay
+        # keep answering from the snapshot until one interval past the next poll, but
+        # never trust "offline" for longer than an interval: backoff may push the next
+        # poll minutes out, and commands should see a server as soon as it's back
+        valid = now + delay + self.interval if st is not None else now + self.interval
+        self.snapshot[key] = (valid, st)
+
+    async def _run(self):
+        tick = min(1.0, self.interval)
+        while True:
+            now = time.monotonic()
+            targets = self.targets()
+            for key in list(self._next_poll):
+                if key not in targets:
+                    self._next_poll.pop(key, None)
+                    self._failures.pop(key, None)
+                    self.snapshot.pop(key, None)
+            for key in targets:
+                due = self._next_poll.get(key)
+                if due is None:
+                    # stagger newly seen servers across one interval
+                    self._next_poll[key] = now + random.uniform(0, self.interval)
+                elif due <= now:
+                    self._next_poll[key] = now + self.interval   # in flight; don't double-schedule
+                    task = asyncio.create_task(self._poll(key))
+                    self._polls.add(task)
+                    task.add_done_callback(self._polls.discard)
+            await asyncio.sleep(tick)
@@ -0,0 +1,383 @@
+import asyncio
+import itertools
+import os
+import struct
+import time
+
+from breaker import CircuitBreakers
+from limits import rcon_limiter
+from metrics import track
+
+RCON_TIMEOUT = float(os.getenv("RCON_TIMEOUT", "5"))
+# packets on one connection go lock-step, so concurrent batches spread over a few connections
+RCON_CONNECTIONS = int(os.getenv("RCON_CONNECTIONS_PER_SERVER", "4"))
+# pooled connections idle this long are closed
+RCON_IDLE_TIMEOUT  = float(os.getenv("RCON_IDLE_TIMEOUT", "300"))
+# a connection idle this long is checked with an empty command before reuse, so one
+# dropped silently (e.g. by a NAT) is replaced instead of timing out a real command
+RCON_PROBE_AFTER   = float(os.getenv("RCON_PROBE_AFTER", "30"))
+RCON_PROBE_TIMEOUT = float(os.getenv("RCON_PROBE_TIMEOUT", "1"))
+
+TYPE_RESPONSE = 0
+TYPE_COMMAND  = 2
+TYPE_AUTH_RESPONSE = 2
+TYPE_LOGIN    = 3
+# commands that only read state, so re-sending one after a dropped connection is harmless
+READ_ONLY_COMMANDS = (
+    "list", "seed", "time query",
+    "scoreboard objectives list", "scoreboard players list", "scoreboard players get",
+)
+# vanilla splits replies into packets of this many bytes; a shorter packet ends the reply
+RCON_FRAGMENT = 4096
+# a batch is split over the server's connections, but never into chunks smaller than this
+RCON_MIN_CHUNK = 4
+
+
+def is_read_only(cmd: str) -> bool:
+    cmd = " ".join(cmd.lower().split())
+    return any(cmd == ro or cmd.startswith(ro + " ") for ro in READ_ONLY_COMMANDS)
+
+
+class RconError(Exception):
+    pass
+
+
+class RconUnreachable(RconError):
+    """The server didn't accept or answer in time, as opposed to rejecting the login."""
+
+
+class RconTimeout(RconError):
+    """A command got no reply in time on a connection the server was still answering."""
+
+
+def encode_packet(req_id: int, ptype: int, body: str) -> bytes:
+    payload = struct.pack("<ii", req_id, ptype) + body.encode("utf8") + b"\x00\x00"
+    return struct.pack("<i", len(payload)) + payload
+
+
+async def read_packet(reader: asyncio.StreamReader):
+    (length,) = struct.unpack("<i", await reader.readexactly(4))
+    payload = await reader.readexactly(length)
+    req_id, ptype = struct.unpack("<ii", payload[:8])
+    return req_id, ptype, payload[8:-2]
+
+
+class AsyncRcon:
+    """Single authenticated RCON connection that multiplexes commands by request ID.
+
+    Vanilla reads each packet with a single socket read and drops the
+    connection if that read holds anything else, so packets are sent lock-step:
+    each one is written and drained on its own, and the next is sent only once
+    the server has answered it. A reply ends with its first packet shorter than
+    RCON_FRAGMENT bytes. When the first packet is a full fragment, an empty
+    command is sent as a marker: its reply can only arrive after the rest of
+    the command's reply, so it marks where that reply ends.
+    """
+
+    def __init__(self, host: str, port: int, password: str, timeout: float = RCON_TIMEOUT):
+        self.host     = host
+        self.port     = port
+        self.password = password
+        self.timeout  = timeout
+        self.inflight = 0
+        self.packets_sent = 0
+        self.replies      = 0
+        self.last_reply   = time.monotonic()
+        self._ids       = itertools.count(1)
+        self._reader    = None
+        self._writer    = None
+        self._read_task = None
+        self._send_lock = asyncio.Lock()
+        self._acks      = {}   # packet id -> Future resolved by the first reply carrying that id
+        self._pending   = {}   # command id -> Future[str]
+        self._fragments = {}   # command id -> [bytes, ...]
+        self._markers   = {}   # marker id -> command id
+
+    @property
+    def closed(self) -> bool:
+        return self._read_task is None or self._read_task.done()
+
+    @property
+    def idle_for(self) -> float:
+        """Seconds since the server last answered, or 0 while a batch is running."""
+        return 0.0 if self.inflight else time.monotonic() - self.last_reply
+
+    def _next_id(self) -> int:
+        req_id = next(self._ids)
+        if req_id >= 2**31 - 1:
+            self._ids = itertools.count(1)
+            req_id = next(self._ids)
+        return req_id
+
+    async def connect(self):
+        try:
+            self._reader, self._writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port), self.timeout
+            )
+            login_id = self._next_id()
+            self._writer.write(encode_packet(login_id, TYPE_LOGIN, self.password))
+            await self._writer.drain()
+            while True:
+                req_id, ptype, _ = await asyncio.wait_for(read_packet(self._reader), self.timeout)
+                if ptype == TYPE_AUTH_RESPONSE:
+                    break
+        except asyncio.TimeoutError:
+            await self.close()
+            raise RconUnreachable("RCON connection timed out.")
+        except (OSError, asyncio.IncompleteReadError) as e:
+            await self.close()
+            raise RconUnreachable(f"RCON connection failed: {e}")
+        if req_id == -1:
+            await self.close()
+            raise RconError("RCON login failed; check the password.")
+        self.last_reply = time.monotonic()
+        self._read_task = asyncio.create_task(self._read_loop())
+
+    async def _read_loop(self):
+        try:
+            while True:
+                req_id, ptype, body = await read_packet(self._reader)
+                self.replies += 1
+                self.last_reply = time.monotonic()
+                ack = self._acks.pop(req_id, None)
+                if ack is not None and not ack.done():
+                    ack.set_result(None)
+                if req_id in self._fragments:
+                    self._fragments[req_id].append(body)
+                    if len(body) < RCON_FRAGMENT:
+                        self._finish(req_id)
+                elif req_id in self._markers:
+                    self._finish(self._markers.pop(req_id))
+        except (OSError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._fail_pending(RconError("RCON connection closed."))
+
+    def _finish(self, cmd_id: int):
+        fut = self._pending.pop(cmd_id, None)
+        parts = self._fragments.pop(cmd_id, [])
+        if fut is not None and not fut.done():
+            fut.set_result(b"".join(parts).decode("utf8", "replace"))
+
+    def _fail_pending(self, exc: Exception):
+        for fut in (*self._pending.values(), *self._acks.values()):
+            if not fut.done():
+                fut.set_exception(exc)
+        self._pending.clear()
+        self._acks.clear()
+        self._fragments.clear()
+        self._markers.clear()
+
+    async def _send(self, req_id: int, ptype: int, body: str, timeout: float = None):
+        """Write one packet and wait up to `timeout` for the server to answer it."""
+        async with self._send_lock:
+            if self.closed:
+                raise RconError("RCON connection closed.")
+            ack = self._acks[req_id] = asyncio.get_running_loop().create_future()
+            self._writer.write(encode_packet(req_id, ptype, body))
+            self.packets_sent += 1
+            try:
+                await asyncio.wait_for(self._drain_and_wait(ack), timeout or self.timeout)
+            except asyncio.TimeoutError:
+                # the server may still answer the packet we gave up on; close before
+                # anyone queued on the lock can send on this connection
+                await self.close()
+                raise
+
+    async def _drain_and_wait(self, ack):
+        await self._writer.drain()
+        await ack
+
+    async def _run(self, cmd: str) -> str:
+        cmd_id, marker_id = self._next_id(), self._next_id()
+        fut = asyncio.get_running_loop().create_future()
+        self._pending[cmd_id]   = fut
+        self._fragments[cmd_id] = []
+        self._markers[marker_id] = cmd_id
+        try:
+            await self._send(cmd_id, TYPE_COMMAND, cmd)
+            if not fut.done():
+                await self._send(marker_id, TYPE_COMMAND, "")
+            return await fut
+        finally:
+            if fut.done() and not fut.cancelled():
+                fut.exception()   # a dropped connection may surface through the ack instead
+            self._pending.pop(cmd_id, None)
+            self._fragments.pop(cmd_id, None)
+            self._markers.pop(marker_id, None)
+            self._acks.pop(cmd_id, None)
+            self._acks.pop(marker_id, None)
+
+    async def command(self, cmd: str) -> str:
+        return (await self.batch([cmd]))[0]
+
+    async def ping(self, timeout: float) -> bool:
+        """Round-trip an empty command; on no answer, close the connection and return False."""
+        req_id = self._next_id()
+        self.inflight += 1   # so concurrent callers don't pick this connection mid-check
+        try:
+            await self._send(req_id, TYPE_COMMAND, "", timeout)
+            return True
+        except (asyncio.TimeoutError, RconError, OSError):
+            await self.close()
+            return False
+        finally:
+            self.inflight -= 1
+            self._acks.pop(req_id, None)
+
+    async def batch(self, cmds) -> list:
+        """Run commands on this connection in order, one round trip each.
+
+        The timeout applies to each packet, so a long batch on a slow server
+        doesn't time out as a whole.
+        """
+        if self.closed:
+            raise RconError("RCON connection closed.")
+        self.inflight += 1
+        replies = self.replies
+        try:
+            return await asyncio.gather(*(self._run(cmd) for cmd in cmds))
+        except asyncio.TimeoutError:
+            await self.close()
+            if self.replies != replies:
+                raise RconTimeout("RCON command timed out; the server is responding slowly.")
+            raise RconUnreachable("RCON command timed out.")
+        except OSError as e:
+            await self.close()
+            raise RconUnreachable(f"RCON connection failed: {e}")
+        finally:
+            self.inflight -= 1
+
+    async def close(self):
+        if self._read_task is not None:
+            self._read_task.cancel()
+            self._read_task = None
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except OSError:
+                pass
+            self._writer = None
+        self._fail_pending(RconError("RCON connection closed."))
+
+
+class RconClients:
+    """Up to `per_server` shared AsyncRcon connections per (ip, port, password), opened on demand.
+
+    Connections idle longer than `idle_timeout` are closed the next time any
+    connection is requested, and one idle longer than `probe_after` is checked
+    with an empty command before it is reused.
+    """
+
+    def __init__(
+        self,
+        timeout: float = RCON_TIMEOUT,
+        per_server: int = RCON_CONNECTIONS,
+        idle_timeout: float = RCON_IDLE_TIMEOUT,
+        probe_after: float = RCON_PROBE_AFTER,
+        probe_timeout: float = RCON_PROBE_TIMEOUT,
+    ):
+        self.timeout       = timeout
+        self.per_server    = per_server
+        self.idle_timeout  = idle_timeout
+        self.probe_after   = probe_after
+        self.probe_timeout = probe_timeout
+        self._clients = {}   # key -> [AsyncRcon, ...]
+        self._locks   = {}
+
+    async def _evict_idle(self):
+        stale = []
+        for key, clients in list(self._clients.items()):
+            idle = [c for c in clients if c.idle_for > self.idle_timeout]
+            if idle:
+                stale += idle
+                self._clients[key] = [c for c in clients if c not in idle]
+        for client in stale:
+            await client.close()
+
+    async def _usable(self, client: AsyncRcon) -> bool:
+        return client.idle_for <= self.probe_after or await client.ping(self.probe_timeout)
+
+    def _pick(self, key):
+        """Least busy open connection, or None when a new one should be opened."""
+        clients = self._clients[key] = [c for c in self._clients.get(key, []) if not c.closed]
+        client = min(clients, key=lambda c: c.inflight, default=None)
+        if client is not None and (client.inflight == 0 or len(clients) >= self.per_server):
+            return client
+        return None
+
+    async def get(self, ip: str, port: int, password: str) -> AsyncRcon:
+        key = (ip, port, password)
+        await self._evict_idle()
+        client = self._pick(key)
+        if client is not None and await self._usable(client):
+            return client
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            client = self._pick(key)
+            if client is not None and await self._usable(client):
+                return client
+            client = AsyncRcon(ip, port, password, self.timeout)
+            await client.connect()
+            self._clients[key].append(client)
+            return client
+
+    async def batch(self, cmds, ip: str, port: int, password: str) -> list:
+        """Split `cmds` over up to `per_server` connections; replies come back in order."""
+        cmds = list(cmds)
+        size = max(RCON_MIN_CHUNK, -(-len(cmds) // self.per_server))
+        if len(cmds) <= size:
+            return await self._batch_on_one(cmds, ip, port, password)
+        parts = await asyncio.gather(*(
+            self._batch_on_one(cmds[i:i + size], ip, port, password) for i in range(0, len(cmds), size)
+        ))
+        return [reply for part in parts for reply in part]
+
+    async def _batch_on_one(self, cmds, ip: str, port: int, password: str) -> list:
+        client = await self.get(ip, port, password)
+        sent = client.packets_sent
+        try:
+            return await client.batch(cmds)
+        except (RconUnreachable, RconTimeout):
+            raise   # timed out or refused: a second try would only double the wait
+        except RconError:
+            if not client.closed:
+                raise
+            # the pooled connection died under us (server restart). Retry once, but only if
+            # nothing went out on it since, or if re-running every command is harmless
+            if client.packets_sent != sent and not all(map(is_read_only, cmds)):
+                raise
+            client = await self.get(ip, port, password)
+            return await client.batch(cmds)
+
+    async def command(self, cmd: str, ip: str, port: int, password: str) -> str:
+        return (await self.batch([cmd], ip, port, password))[0]
+
+    async def close(self):
+        pools, self._clients = list(self._clients.values()), {}
+        for client in (c for pool in pools for c in pool):
+            await client.close()
+
+rcon_clients = RconClients()
+rcon_breakers = CircuitBreakers("rcon", failure_types=(RconUnreachable,))
+
+async def rcon_command(cmd: str, cfg: dict) -> str:
+    return (await rcon_batch([cmd], cfg))[0]
+
+async def rcon_batch(cmds, cfg: dict) -> list:
+    """Run several commands spread over the server's pooled connections; replies come back in order.
+
+    Each command is one round trip on its connection, so a batch takes about
+    len(cmds) / RCON_CONNECTIONS round trips.
+    """
+    ip, port, pw = cfg["ip"], cfg["port"], cfg["password"]
+    if not pw:
+        raise RuntimeError("RCON password not set for this server.")
+    cmds = list(cmds)
+    if not cmds:
+        return []
+    with rcon_breakers.guard((ip, port)):
+        async with rcon_limiter.slot((ip, port)):
+            with track("rcon"):
+                return await rcon_clients.batch(cmds, ip, port, pw)
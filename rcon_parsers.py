@@ -0,0 +1,72 @@
+import re
+
+# §-prefixed colour/format codes that servers and plugins embed in replies
+FORMAT_CODE   = re.compile("§.", re.S)
+SCORE_ENTRY   = re.compile(r"(\S+) has (-?\d+)")
+PLAYER_SCORE  = re.compile(r" has (-?\d+)")
+PLAYER_COUNT  = re.compile(r"(\d+)\D+?(\d+)")
+TIME_QUERY    = re.compile(r"The time is (-?\d+)")
+SEED          = re.compile(r"Seed: \[?(-?\d+)\]?")
+
+
+def strip_formatting(text: str) -> str:
+    if "§" not in text:
+        return text
+    return FORMAT_CODE.sub("", text)
+
+
+def parse_objectives(raw: str):
+    """`scoreboard objectives list` -> objective names.
+
+    Handles both `There are 2 objective(s): [kills], [deaths]` and the
+    pre-1.13 `... objective(s) on scoreboard:- kills: displays as ...` forms.
+    """
+    raw = strip_formatting(raw)
+    start = raw.find(":") + 1
+    if not start:
+        return []
+    names = []
+    for part in raw[start:].split(","):
+        token = part.strip().lstrip("- ").split(" ", 1)[0].strip("[]:")
+        if token:
+            names.append(token)
+    return names
+
+
+def iter_scores(raw: str):
+    """Lazily yield (name, score) pairs from a `scoreboard players list` reply."""
+    raw = strip_formatting(raw)
+    start = raw.find(":") + 1
+    if not start:
+        return
+    for m in SCORE_ENTRY.finditer(raw, start):
+        yield m.group(1), int(m.group(2))
+
+
+def parse_score(raw: str):
+    """`scoreboard players get` -> int, or None when the player has no score set or the
+    reply isn't a score at all (unknown objective, permission error, ...)."""
+    m = PLAYER_SCORE.search(strip_formatting(raw))
+    return int(m.group(1)) if m else None
+
+
+def parse_players(raw: str):
+    """`list` -> (online, max, names); online/max are None if the reply isn't recognised."""
+    raw = strip_formatting(raw)
+    head, sep, tail = raw.partition(":")
+    m = PLAYER_COUNT.search(head)
+    online, max_players = (int(m.group(1)), int(m.group(2))) if m else (None, None)
+    names = [n.strip() for n in tail.split(",") if n.strip()] if sep else []
+    return online, max_players, names
+
+
+def parse_time(raw: str):
+    """`time query <daytime|gametime|day>` -> ticks, or None."""
+    m = TIME_QUERY.search(strip_formatting(raw))
+    return int(m.group(1)) if m else None
+
+
+def parse_seed(raw: str):
+    """`seed` -> the seed digits, or None."""
+    m = SEED.search(strip_formatting(raw))
+    return m.group(1) if m else None
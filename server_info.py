@@ -1,18 +1,98 @@
 import asyncio
+import os
 import discord
 from discord.ext import commands
 from discord import app_commands
 from mcstatus import JavaServer
 
-from utils import get_guild_config, run_rcon_command
+from breaker import ServerUnavailable, status_breakers
+from limits import ServerBusy, run_status
+from player_lookup import player_lookup
+from rcon  import rcon_command
+from rcon_parsers import parse_seed, parse_time, strip_formatting
+from poller import MISSING
+from status_cache import status_cache
+from utils import get_guild_config, server_profiles
 
 TEST_GUILD = discord.Object(id=800622420536590346)
+NETWORK_TIMEOUT = float(os.getenv("MC_NETWORK_TIMEOUT", "5"))
+NO_SERVERS      = "ℹ️ No servers configured yet; an admin can add one with `!config`."
 
 class ServerInfoCog(commands.Cog):
     """Prefix + Slash commands for Minecraft server status and RCON queries."""
     def __init__(self, bot):
         self.bot = bot
 
+    async def _status(self, ip, port):
+        poller = getattr(self.bot, "status_poller", None)
+        if poller is not None:
+            st = poller.lookup(ip, port)
+            if st is not MISSING:
+                if st is None:
+                    raise ConnectionError("Server was offline at the last poll.")
+                return st
+        return await status_cache.status(ip, port)
+
+    async def _players_message(self, ip, port) -> str:
+        try:
+            pl = await player_lookup.players(ip, port, self._status)
+        except ServerUnavailable as e:
+            return f"⚠️ {e}"
+        except ServerBusy as e:
+            return f"⏳ {e}"
+        except Exception:
+            return "⚠️ Server appears offline or unreachable."
+        if not pl.online:
+            return f"No players online. (0/{pl.max})"
+        msg = f"🧑‍💻 Players online ({pl.online}/{pl.max})"
+        if pl.names:
+            msg += ": " + ", ".join(pl.names)
+            if not pl.complete:
+                msg += f" and {pl.online - len(pl.names)} more"
+        return msg
+
+    async def _network_embed(self, guild_id: str):
+        """Ping every server profile at once; anything still pending at the deadline counts as timed out.
+        None when the guild hasn't configured any server."""
+        profiles = server_profiles(self.bot, guild_id)
+        if not profiles:
+            return None
+        tasks = {
+            name: asyncio.create_task(self._status(cfg["ip"], cfg["port"]))
+            for name, cfg in profiles.items() if cfg["ip"]
+        }
+        if tasks:
+            _, pending = await asyncio.wait(tasks.values(), timeout=NETWORK_TIMEOUT)
+            for task in pending:
+                task.cancel()
+
+        online = players = slots = 0
+        e = discord.Embed(title="🌐 Network Status", color=0x00ff00)
+        for name, task in tasks.items():
+            cfg = profiles[name]
+            if not task.done() or task.cancelled():
+                value = "⏱️ Timed out"
+            elif task.exception() is not None:
+                err = task.exception()
+                value = f"⚠️ {err}" if isinstance(err, (ServerBusy, ServerUnavailable)) else "⚠️ Offline"
+            else:
+                st = task.result()
+                online  += 1
+                players += st.players.online
+                slots   += st.players.max
+                value = f"✅ {st.players.online}/{st.players.max} players • {round(st.latency)} ms"
+            e.add_field(name=f"{name} (`{cfg['ip']}:{cfg['port']}`)", value=value, inline=False)
+        e.description = f"**{players}/{slots}** players across **{online}/{len(tasks)}** servers online"
+        if online < len(tasks):
+            e.color = 0xffaa00 if online else 0xff0000
+        return e
+
+    async def _network_reply(self, guild_id: str, send):
+        embed = await self._network_embed(guild_id)
+        if embed is None:
+            return await send(NO_SERVERS)
+        await send(embed=embed)
+
     #
     # --- PREFIX COMMANDS ---
     #
@@ -20,25 +100,48 @@ class ServerInfoCog(commands.Cog):
     @commands.command(
         name="mcstatus",
         help="**Usage**\n"
-             "`!mcstatus`\n\n"
-             "Checks if the Minecraft server is online and shows player count.\n\n"
+             "`!mcstatus [profile|all]`\n\n"
+             "Checks if the Minecraft server is online and shows player count. "
+             "Give a profile name for another configured server, or `all` for every one at once.\n\n"
              "**Example**\n"
-             "`!mcstatus`"
+             "`!mcstatus`\n"
+             "`!mcstatus all`"
     )
-    async def mcstatus(self, ctx):
-        cfg = ctx.bot.server_configs.get(str(ctx.guild.id), {})
+    async def mcstatus(self, ctx, profile: str = None):
+        if profile and profile.lower() == "all":
+            return await self._network_reply(str(ctx.guild.id), ctx.send)
+        if profile:
+            cfg = get_guild_config(self.bot, str(ctx.guild.id), profile)
+            if cfg is None:
+                return await ctx.send(f"❌ No server profile named `{profile}`.")
+        else:
+            cfg = ctx.bot.server_configs.get(str(ctx.guild.id), {})
         ip   = cfg.get("ip", "mc.hypixel.net")
         port = cfg.get("port", 25565)
-        srv  = JavaServer(ip, port)
         try:
-            st = await asyncio.get_event_loop().run_in_executor(None, srv.status)
+            st = await self._status(ip, port)
             await ctx.send(
                 f"✅ **Online!** {st.players.online}/{st.players.max} players\n"
                 f"Latency: {round(st.latency)} ms"
             )
+        except ServerUnavailable as e:
+            await ctx.send(f"⚠️ {e}")
+        except ServerBusy as e:
+            await ctx.send(f"⏳ {e}")
         except:
             await ctx.send("⚠️ Server appears offline or unreachable.")
 
+    @commands.command(
+        name="network",
+        help="**Usage**\n"
+             "`!network`\n\n"
+             "Checks every configured server at once and shows total players; same as `!mcstatus all`.\n\n"
+             "**Example**\n"
+             "`!network`"
+    )
+    async def network(self, ctx):
+        await self._network_reply(str(ctx.guild.id), ctx.send)
+
     @commands.command(
         name="mcplayers",
         help="**Usage**\n"
@@ -50,17 +153,7 @@ class ServerInfoCog(commands.Cog):
     async def mcplayers(self, ctx):
         cfg = ctx.bot.server_configs.get(str(ctx.guild.id), {})
         ip, port = cfg.get("ip",""), cfg.get("port",25565)
-        srv = JavaServer(ip, port)
-        try:
-            q = await asyncio.get_event_loop().run_in_executor(None, srv.query)
-            names = q.players.names
-        except:
-            st = await asyncio.get_event_loop().run_in_executor(None, srv.status)
-            names = [p.name for p in st.players.sample] if st.players.sample else []
-        if names:
-            await ctx.send(f"🧑‍💻 Players online ({len(names)}/{st.players.max}): {', '.join(names)}")
-        else:
-            await ctx.send(f"No players online. (0/{st.players.max})")
+        await ctx.send(await self._players_message(ip, port))
 
     @commands.command(
         name="mcinfo",
@@ -73,15 +166,18 @@ class ServerInfoCog(commands.Cog):
     async def mcinfo(self, ctx):
         cfg = ctx.bot.server_configs.get(str(ctx.guild.id), {})
         ip, port = cfg.get("ip",""), cfg.get("port",25565)
-        srv = JavaServer(ip, port)
         try:
-            st = await asyncio.get_event_loop().run_in_executor(None, srv.status)
+            st = await self._status(ip, port)
             e = discord.Embed(title="Server Info", color=0x00ff00)
             e.add_field(name="IP",      value=f"`{ip}:{port}`", inline=False)
             e.add_field(name="Version", value=st.version.name, inline=True)
             e.add_field(name="Players", value=f"{st.players.online}/{st.players.max}", inline=True)
             e.add_field(name="Latency", value=f"{round(st.latency)} ms", inline=True)
             await ctx.send(embed=e)
+        except ServerUnavailable as e:
+            await ctx.send(f"⚠️ {e}")
+        except ServerBusy as e:
+            await ctx.send(f"⏳ {e}")
         except:
             await ctx.send("⚠️ Unable to retrieve server information.")
 
@@ -98,8 +194,13 @@ class ServerInfoCog(commands.Cog):
         ip, port = cfg.get("ip",""), cfg.get("port",25565)
         srv = JavaServer(ip, port)
         try:
-            ping = await asyncio.get_event_loop().run_in_executor(None, srv.ping)
+            with status_breakers.guard((ip, port)):
+                ping = await run_status("ping", (ip, port), srv.ping)
             await ctx.send(f"🏓 Ping: {round(ping,5)} ms")
+        except ServerUnavailable as e:
+            await ctx.send(f"⚠️ {e}")
+        except ServerBusy as e:
+            await ctx.send(f"⏳ {e}")
         except:
             await ctx.send("⚠️ Failed to ping the server.")
 
@@ -114,9 +215,9 @@ class ServerInfoCog(commands.Cog):
     async def mctime(self, ctx):
         cfg = get_guild_config(self.bot, str(ctx.guild.id))
         try:
-            resp = await asyncio.get_event_loop().run_in_executor(
-                None, run_rcon_command, "time query daytime", cfg
-            )
+            raw = await rcon_command("time query daytime", cfg)
+            ticks = parse_time(raw)
+            resp = f"{ticks} ticks" if ticks is not None else strip_formatting(raw)
             await ctx.send(f"🕒 In-game time: {resp}")
         except Exception as e:
             await ctx.send(f"⚠️ RCON error: {e}")
@@ -132,9 +233,8 @@ class ServerInfoCog(commands.Cog):
     async def mcseed(self, ctx):
         cfg = get_guild_config(self.bot, str(ctx.guild.id))
         try:
-            resp = await asyncio.get_event_loop().run_in_executor(
-                None, run_rcon_command, "seed", cfg
-            )
+            raw = await rcon_command("seed", cfg)
+            resp = parse_seed(raw) or strip_formatting(raw)
             await ctx.send(f"🌱 World seed: {resp}")
         except Exception as e:
             await ctx.send(f"⚠️ RCON error: {e}")
@@ -151,9 +251,7 @@ class ServerInfoCog(commands.Cog):
     async def mcstop(self, ctx):
         cfg = get_guild_config(self.bot, str(ctx.guild.id))
         try:
-            await asyncio.get_event_loop().run_in_executor(
-                None, run_rcon_command, "stop", cfg
-            )
+            await rcon_command("stop", cfg)
             await ctx.send("🔌 Server stopping…")
         except Exception as e:
             await ctx.send(f"⚠️ RCON error: {e}")
@@ -169,16 +267,27 @@ class ServerInfoCog(commands.Cog):
     async def mcstatus_slash(self, interaction: discord.Interaction):
         cfg = self.bot.server_configs.get(str(interaction.guild_id), {})
         ip, port = cfg.get("ip",""), cfg.get("port",25565)
-        srv = JavaServer(ip, port)
         try:
-            st = await asyncio.get_event_loop().run_in_executor(None, srv.status)
+            st = await self._status(ip, port)
             await interaction.response.send_message(
                 f"✅ **Online!** {st.players.online}/{st.players.max} players\n"
                 f"Latency: {round(st.latency)} ms"
             )
+        except ServerUnavailable as e:
+            await interaction.response.send_message(f"⚠️ {e}")
+        except ServerBusy as e:
+            await interaction.response.send_message(f"⏳ {e}")
         except:
             await interaction.response.send_message("⚠️ Server appears offline or unreachable.")
 
+    @app_commands.command(
+        name="network",
+        description="Checks every configured server at once and shows total players."
+    )
+    async def network_slash(self, interaction: discord.Interaction):
+        await interaction.response.defer()
+        await self._network_reply(str(interaction.guild_id), interaction.followup.send)
+
     @app_commands.command(
         name="mcplayers",
         description="Lists currently online players."
@@ -186,19 +295,7 @@ class ServerInfoCog(commands.Cog):
     async def mcplayers_slash(self, interaction: discord.Interaction):
         cfg = self.bot.server_configs.get(str(interaction.guild_id), {})
         ip, port = cfg.get("ip",""), cfg.get("port",25565)
-        srv = JavaServer(ip, port)
-        try:
-            q = await asyncio.get_event_loop().run_in_executor(None, srv.query)
-            names = q.players.names
-        except:
-            st = await asyncio.get_event_loop().run_in_executor(None, srv.status)
-            names = [p.name for p in st.players.sample] if st.players.sample else []
-        if names:
-            await interaction.response.send_message(
-                f"🧑‍💻 Players online ({len(names)}/{st.players.max}): {', '.join(names)}"
-            )
-        else:
-            await interaction.response.send_message(f"No players online. (0/{st.players.max})")
+        await interaction.response.send_message(await self._players_message(ip, port))
 
     @app_commands.command(
         name="mcinfo",
@@ -207,15 +304,18 @@ class ServerInfoCog(commands.Cog):
     async def mcinfo_slash(self, interaction: discord.Interaction):
         cfg = self.bot.server_configs.get(str(interaction.guild_id), {})
         ip, port = cfg.get("ip",""), cfg.get("port",25565)
-        srv = JavaServer(ip, port)
         try:
-            st = await asyncio.get_event_loop().run_in_executor(None, srv.status)
+            st = await self._status(ip, port)
             e = discord.Embed(title="Server Info", color=0x00ff00)
             e.add_field(name="IP",      value=f"`{ip}:{port}`", inline=False)
             e.add_field(name="Version", value=st.version.name, inline=True)
             e.add_field(name="Players", value=f"{st.players.online}/{st.players.max}", inline=True)
             e.add_field(name="Latency", value=f"{round(st.latency)} ms", inline=True)
             await interaction.response.send_message(embed=e)
+        except ServerUnavailable as e:
+            await interaction.response.send_message(f"⚠️ {e}")
+        except ServerBusy as e:
+            await interaction.response.send_message(f"⏳ {e}")
         except:
             await interaction.response.send_message("⚠️ Unable to retrieve server information.")
 
@@ -228,8 +328,13 @@ class ServerInfoCog(commands.Cog):
         ip, port = cfg.get("ip",""), cfg.get("port",25565)
         srv = JavaServer(ip, port)
         try:
-            ping = await asyncio.get_event_loop().run_in_executor(None, srv.ping)
+            with status_breakers.guard((ip, port)):
+                ping = await run_status("ping", (ip, port), srv.ping)
             await interaction.response.send_message(f"🏓 Ping: {round(ping,5)} ms")
+        except ServerUnavailable as e:
+            await interaction.response.send_message(f"⚠️ {e}")
+        except ServerBusy as e:
+            await interaction.response.send_message(f"⏳ {e}")
         except:
             await interaction.response.send_message("⚠️ Failed to ping the server.")
 
@@ -240,9 +345,9 @@ class ServerInfoCog(commands.Cog):
     async def mctime_slash(self, interaction: discord.Interaction):
         cfg = get_guild_config(self.bot, str(interaction.guild_id))
         try:
-            resp = await asyncio.get_event_loop().run_in_executor(
-                None, run_rcon_command, "time query daytime", cfg
-            )
+            raw = await rcon_command("time query daytime", cfg)
+            ticks = parse_time(raw)
+            resp = f"{ticks} ticks" if ticks is not None else strip_formatting(raw)
             await interaction.response.send_message(f"🕒 In-game time: {resp}")
         except Exception as e:
             await interaction.response.send_message(f"⚠️ RCON error: {e}")
@@ -254,9 +359,8 @@ class ServerInfoCog(commands.Cog):
     async def mcseed_slash(self, interaction: discord.Interaction):
         cfg = get_guild_config(self.bot, str(interaction.guild_id))
         try:
-            resp = await asyncio.get_event_loop().run_in_executor(
-                None, run_rcon_command, "seed", cfg
-            )
+            raw = await rcon_command("seed", cfg)
+            resp = parse_seed(raw) or strip_formatting(raw)
             await interaction.response.send_message(f"🌱 World seed: {resp}")
         except Exception as e:
             await interaction.response.send_message(f"⚠️ RCON error: {e}")
@@ -269,9 +373,7 @@ class ServerInfoCog(commands.Cog):
     async def mcstop_slash(self, interaction: discord.Interaction):
         cfg = get_guild_config(self.bot, str(interaction.guild_id))
         try:
-            await asyncio.get_event_loop().run_in_executor(
-                None, run_rcon_command, "stop", cfg
-            )
+            await rcon_command("stop", cfg)
             await interaction.response.send_message("🔌 Server stopping…")
         except Exception as e:
             await interaction.response.send_message(f"⚠️ RCON error: {e}")
@@ -0,0 +1,124 @@
+import heapq
+import json
+import os
+import time
+from operator import itemgetter
+
+SESSIONS_PATH    = os.getenv("SESSIONS_PATH", "sessions.jsonl")
+SESSION_INTERVAL = float(os.getenv("MC_SESSION_INTERVAL", "60"))
+
+
+def format_duration(seconds: float) -> str:
+    minutes = int(seconds) // 60
+    if not minutes:
+        return "<1m"
+    days, minutes = divmod(minutes, 1440)
+    hours, minutes = divmod(minutes, 60)
+    parts = [f"{days}d"] if days else []
+    if hours:
+        parts.append(f"{hours}h")
+    if minutes:
+        parts.append(f"{minutes}m")
+    return " ".join(parts)
+
+
+class SessionTracker:
+    """Join/leave events per guild, kept as running playtime totals.
+
+    Events are appended to a JSONL log, one {"t", "g", "p", "e"} object per line;
+    the log is replayed once at start-up and every lookup afterwards is answered
+    from the in-memory totals.
+    """
+
+    def __init__(self, path: str = SESSIONS_PATH):
+        self.path    = path
+        self.online  = {}   # guild_id -> {player: joined_at}
+        self.totals  = {}   # guild_id -> {player: seconds in finished sessions}
+        self._buffer = []   # encoded events not yet appended to the log
+
+    @classmethod
+    def load(cls, path: str = SESSIONS_PATH):
+        t = cls(path)
+        if not os.path.exists(path):
+            return t
+        with open(path) as f:
+            for line in f:
+                try:
+                    ev = json.loads(line)
+                except ValueError:
+                    continue   # torn final line from a crash
+                if ev["e"] == "join":
+                    t.online.setdefault(ev["g"], {})[ev["p"]] = ev["t"]
+                else:
+                    t._close(ev["g"], ev["p"], ev["t"])
+        # sessions still open at shutdown/crash end at the last poll (see append)
+        t.close_all(os.path.getmtime(path))
+        return t
+
+    def _event(self, ts: float, guild_id: str, player: str, kind: str):
+        self._buffer.append(json.dumps({"t": ts, "g": guild_id, "p": player, "e": kind}) + "\n")
+
+    def _close(self, guild_id: str, player: str, ts: float):
+        joined = self.online.get(guild_id, {}).pop(player, None)
+        if joined is not None:
+            totals = self.totals.setdefault(guild_id, {})
+            totals[player] = totals.get(player, 0.0) + max(ts - joined, 0.0)
+
+    def observe(self, guild_id: str, players, ts: float = None):
+        """Diff one poll's player set against the previous one and record joins/leaves."""
+        ts = time.time() if ts is None else ts
+        current = self.online.setdefault(guild_id, {})
+        players = set(players)
+        for player in players - current.keys():
+            current[player] = ts
+            self._event(ts, guild_id, player, "join")
+        for player in current.keys() - players:
+            self._close(guild_id, player, ts)
+            self._event(ts, guild_id, player, "leave")
+
+    def close_all(self, ts: float = None):
+        ts = time.time() if ts is None else ts
+        for guild_id, current in self.online.items():
+            for player in list(current):
+                self._close(guild_id, player, ts)
+                self._event(ts, guild_id, player, "leave")
+
+    def _resolve(self, guild_id: str, player: str):
+        """Exact name if known, else a case-insensitive match."""
+        online, totals = self.online.get(guild_id, {}), self.totals.get(guild_id, {})
+        if player in online or player in totals:
+            return player
+        folded = player.casefold()
+        for name in (*online, *totals):
+            if name.casefold() == folded:
+                return name
+        return None
+
+    def playtime(self, guild_id: str, player: str, ts: float = None):
+        """(name, total seconds, online since or None); None if the player was never seen."""
+        name = self._resolve(guild_id, player)
+        if name is None:
+            return None
+        ts = time.time() if ts is None else ts
+        joined = self.online.get(guild_id, {}).get(name)
+        total = self.totals.get(guild_id, {}).get(name, 0.0)
+        if joined is not None:
+            total += ts - joined
+        return name, total, joined
+
+    def top(self, guild_id: str, count: int, ts: float = None):
+        ts = time.time() if ts is None else ts
+        totals = dict(self.totals.get(guild_id, {}))
+        for name, joined in self.online.get(guild_id, {}).items():
+            totals[name] = totals.get(name, 0.0) + ts - joined
+        return heapq.nlargest(count, totals.items(), key=itemgetter(1))
+
+    def drain(self):
+        lines, self._buffer = self._buffer, []
+        return lines
+
+    def append(self, lines):
+        """Append events; called after every poll so the log's mtime marks the last poll."""
+        with open(self.path, "a") as f:
+            f.writelines(lines)
+        os.utime(self.path)
@@ -0,0 +1,48 @@
+import os
+
+
+def parse_shard_ids(text: str):
+    """'0-3' or '0,2,5' or '0-3,8' -> [0, 1, 2, 3, 8]; empty -> None."""
+    if not text:
+        return None
+    ids = []
+    for part in text.split(","):
+        part = part.strip()
+        if "-" in part:
+            lo, hi = part.split("-", 1)
+            ids.extend(range(int(lo), int(hi) + 1))
+        elif part:
+            ids.append(int(part))
+    return sorted(set(ids))
+
+
+def shard_ranges(shard_count: int, processes: int):
+    """Split shards 0..shard_count-1 into `processes` contiguous ranges of near-equal size."""
+    processes = max(1, min(processes, shard_count))
+    size, extra = divmod(shard_count, processes)
+    ranges, start = [], 0
+    for i in range(processes):
+        end = start + size + (1 if i < extra else 0)
+        ranges.append(range(start, end))
+        start = end
+    return ranges
+
+
+def shard_for(guild_id, shard_count: int) -> int:
+    """Discord's guild -> shard mapping."""
+    return (int(guild_id) >> 22) % shard_count
+
+
+# SHARD_COUNT unset: plain commands.Bot, one gateway connection
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "0")) or None
+SHARD_IDS   = parse_shard_ids(os.getenv("SHARD_IDS", "")) if SHARD_COUNT else None
+# this process owns only part of the shards, so other processes share the store
+MULTI_PROCESS = SHARD_IDS is not None and len(SHARD_IDS) < SHARD_COUNT
+# exactly one process syncs the command tree and other once-per-bot work
+PRIMARY = SHARD_IDS is None or 0 in SHARD_IDS
+_OWNED = frozenset(SHARD_IDS) if SHARD_IDS is not None else None
+
+
+def owns_guild(guild_id) -> bool:
+    """Whether guild_id's events are delivered to this process."""
+    return _OWNED is None or shard_for(guild_id, SHARD_COUNT) in _OWNED
@@ -1,16 +1,145 @@
 import asyncio
-import re
+import heapq
+import time
+from operator import itemgetter
 import discord
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
 
-from utils import get_guild_config, run_rcon_command, save_json, WAYPOINTS_PATH
+from history import ScoreHistory, parse_duration, HISTORY_INTERVAL
+from paginator import LazyPaginator
+from rcon  import rcon_batch, rcon_command
+from rcon_parsers import iter_scores, parse_objectives, parse_score
+from sessions import format_duration
+from sharding import owns_guild
+from utils import get_guild_config, SERVER_CFG_PATH
+
+MAX_LEADERBOARD = 100   # entries fetched per request
+LB_PER_PAGE     = 10
+
+
+def top_scores(entries, count: int, offset: int = 0, ascending: bool = False):
+    """Rows offset..offset+count of the ranking, via heap selection in O(n log(offset+count))."""
+    select = heapq.nsmallest if ascending else heapq.nlargest
+    return select(offset + count, entries, key=itemgetter(1))[offset:]
+
+
+class LeaderboardPaginator(LazyPaginator):
+    def __init__(self, label: str, rows, offset: int, author, footer_text: str, signed: bool = False, fmt=None):
+        self.label = label
+        self.rows = rows
+        self.offset = offset
+        self.footer_text = footer_text
+        self.signed = signed
+        self.fmt = fmt
+        super().__init__((len(rows) - 1) // LB_PER_PAGE + 1, author)
+
+    def render(self, index: int) -> discord.Embed:
+        embed = discord.Embed(title=f"🏆 Leaderboard: {self.label}", color=0x00ff00)
+        start = index * LB_PER_PAGE
+        for i, (name, score) in enumerate(self.rows[start : start + LB_PER_PAGE], start=self.offset + start + 1):
+            if self.fmt is not None:
+                value = self.fmt(score)
+            else:
+                value = f"{score:+d}" if self.signed else str(score)
+            embed.add_field(name=f"{i}. {name}", value=value, inline=False)
+        if self.page_count > 1:
+            embed.set_footer(text=f"Page {index+1}/{self.page_count} • {self.footer_text}")
+        return embed
 
 class StatsCog(commands.Cog):
     """Prefix & Slash commands for scoreboard objectives & stats (RCON)."""
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        self.history = ScoreHistory.load()
+
+    async def cog_load(self):
+        self.sample_scores.start()
+
+    async def cog_unload(self):
+        self.sample_scores.cancel()
+
+    @tasks.loop(seconds=HISTORY_INTERVAL)
+    async def sample_scores(self):
+        sampled = False
+        for guild_id in list(self.bot.server_configs):
+            if not owns_guild(guild_id):
+                continue
+            objectives = self.bot.server_configs.get(guild_id, {}).get("tracked_objectives") or []
+            if not objectives:
+                continue
+            cfg = get_guild_config(self.bot, guild_id)
+            for objective in objectives:
+                try:
+                    raw = await rcon_command(f"scoreboard players list {objective}", cfg)
+                except Exception:
+                    continue
+                self.history.record(guild_id, objective, iter_scores(raw))
+                sampled = True
+        if sampled:
+            await asyncio.to_thread(self.history.save, self.history.dumps())
+
+    async def _player_stats(self, guild_id: str, player: str):
+        """Every objective's score for one player: one objectives query plus one batch
+        spread over the server's RCON connections."""
+        cfg = get_guild_config(self.bot, guild_id)
+        objectives = parse_objectives(await rcon_command("scoreboard objectives list", cfg))
+        replies = await rcon_batch(
+            (f"scoreboard players get {player} {obj}" for obj in objectives), cfg
+        )
+        stats = []
+        for obj, reply in zip(objectives, replies):
+            score = parse_score(reply)
+            if score is not None:
+                stats.append((obj, score))
+        return stats
+
+    def _player_stats_embed(self, player: str, stats, footer: str) -> discord.Embed:
+        lines, size = [], 0
+        for obj, score in stats:
+            line = f"`{obj}`: **{score}**"
+            size += len(line) + 1
+            if size > 4000:
+                lines.append(f"…and {len(stats) - len(lines)} more")
+                break
+            lines.append(line)
+        embed = discord.Embed(title=f"📊 Stats: {player}", description="\n".join(lines), color=0x00ff00)
+        embed.set_footer(text=footer)
+        return embed
+
+    async def _leaderboard(self, guild_id: str, objective: str, count: int, order: str, offset: int):
+        cfg = get_guild_config(self.bot, guild_id)
+        raw = await rcon_command(f"scoreboard players list {objective}", cfg)
+        count = max(1, min(count, MAX_LEADERBOARD))
+        return top_scores(iter_scores(raw), count, max(0, offset), ascending=(order == "asc"))
+
+    def _history_leaderboard(self, guild_id: str, objective: str, count: int, order: str, offset: int, since: int):
+        """(rows, seconds of history covered) for gains since `since` seconds ago, or None
+        without enough history. Covers less than `since` when tracking started later."""
+        h = self.history.get(guild_id, objective)
+        hit = h.deltas(time.time() - since) if h else None
+        if hit is None:
+            return None
+        covered, deltas = hit
+        count = max(1, min(count, MAX_LEADERBOARD))
+        return top_scores(deltas, count, max(0, offset), ascending=(order == "asc")), covered
+
+    @staticmethod
+    def _since_label(objective: str, since: int, since_text: str, covered: float) -> str:
+        if covered < since - HISTORY_INTERVAL:
+            return f"{objective} (last {format_duration(covered)}; not enough history for {since_text})"
+        return f"{objective} (last {format_duration(covered)})"
+
+    def _set_tracked(self, guild_id: str, objective: str, track: bool) -> bool:
+        raw = self.bot.server_configs.setdefault(guild_id, {})
+        tracked = set(raw.get("tracked_objectives", []))
+        if (objective in tracked) == track:
+            return False
+        tracked = tracked | {objective} if track else tracked - {objective}
+        raw["tracked_objectives"] = sorted(tracked)
+        self.bot.store.mark_dirty(SERVER_CFG_PATH)
+        return True
 
     #
     # --- PREFIX COMMANDS ---
@@ -27,11 +156,8 @@ class StatsCog(commands.Cog):
     async def mcobjs(self, ctx: commands.Context):
         cfg = get_guild_config(self.bot, str(ctx.guild.id))
         try:
-            raw = await asyncio.get_event_loop().run_in_executor(
-                None, run_rcon_command, "scoreboard objectives list", cfg
-            )
-            objs = raw.split(":", 1)[1].split(",") if ":" in raw else []
-            names = [o.strip().split(" ", 1)[0] for o in objs]
+            raw = await rcon_command("scoreboard objectives list", cfg)
+            names = parse_objectives(raw)
             await ctx.send(
                 f"🗒️ Objectives: {', '.join(names)}"
                 if names else "ℹ️ No objectives found."
@@ -52,54 +178,126 @@ class StatsCog(commands.Cog):
             return await ctx.send("❌ Usage: `!mcstat <player> <objective>`")
         cfg = get_guild_config(self.bot, str(ctx.guild.id))
         try:
-            raw = await asyncio.get_event_loop().run_in_executor(
-                None, run_rcon_command,
-                f"scoreboard players get {player} {objective}", cfg
-            )
-            m = re.search(r"(-?\d+)", raw)
-            score = m.group(1) if m else "0"
+            raw = await rcon_command(f"scoreboard players get {player} {objective}", cfg)
+            score = parse_score(raw)
+            if score is None:
+                return await ctx.send(f"ℹ️ `{player}` has no score on `{objective}`.")
             await ctx.send(f"📊 `{player}` has `{score}` on `{objective}`.")
         except Exception as e:
             await ctx.send(f"⚠️ Error: {e}")
 
+    @commands.command(
+        name="mcstats",
+        help="**Usage**\n"
+             "`!mcstats <player>`\n\n"
+             "Shows a player’s score on every scoreboard objective; *requires RCON.*\n\n"
+             "**Example**\n"
+             "`!mcstats Steve`"
+    )
+    async def mcstats(self, ctx: commands.Context, player: str = None):
+        if not player:
+            return await ctx.send("❌ Usage: `!mcstats <player>`")
+        try:
+            stats = await self._player_stats(str(ctx.guild.id), player)
+            if not stats:
+                return await ctx.send(f"ℹ️ `{player}` has no scores.")
+            await ctx.send(embed=self._player_stats_embed(
+                player, stats, f"Requested by {ctx.author.display_name}"
+            ))
+        except Exception as e:
+            await ctx.send(f"⚠️ Error: {e}")
+
     @commands.command(
         name="mcleaderboard",
         help="**Usage**\n"
-             "`!mcleaderboard <objective> [count]`\n\n"
-             "Shows top players for the specified objective; *requires RCON.*\n\n"
+             "`!mcleaderboard <objective> [count] [desc|asc] [offset] [--since <duration>]`\n\n"
+             f"Shows top players for the specified objective (up to {MAX_LEADERBOARD}, "
+             f"{LB_PER_PAGE} per page); *requires RCON.* With `--since`, ranks score gained "
+             "over that period from tracked history (see `!mctrack`) instead.\n\n"
              "**Example**\n"
-             "`!mcleaderboard deaths 10`"
+             "`!mcleaderboard deaths 10` or `!mcleaderboard kills --since 7d`"
     )
-    async def mcleaderboard(self, ctx: commands.Context, objective: str = None, count: int = 5):
+    async def mcleaderboard(self, ctx: commands.Context, objective: str = None, *args):
+        usage = "❌ Usage: `!mcleaderboard <objective> [count] [desc|asc] [offset] [--since <duration>]`"
         if not objective:
-            return await ctx.send("❌ Usage: `!mcleaderboard <objective> [count]`")
-        cfg = get_guild_config(self.bot, str(ctx.guild.id))
+            return await ctx.send(usage)
+        order, since, since_text, nums = "desc", None, None, []
+        it = iter(args)
+        for a in it:
+            low = a.lower()
+            if low == "--since":
+                since_text = next(it, "")
+                since = parse_duration(since_text)
+                if since is None:
+                    return await ctx.send("❌ `--since` takes a duration like `7d`, `12h` or `1w`.")
+            elif low in ("asc", "desc"):
+                order = low
+            elif a.lstrip("-").isdigit() and len(nums) < 2:
+                nums.append(int(a))
+            else:
+                return await ctx.send(usage)
+        count  = nums[0] if nums else 5
+        offset = nums[1] if len(nums) > 1 else 0
+        guild_id = str(ctx.guild.id)
         try:
-            raw = await asyncio.get_event_loop().run_in_executor(
-                None, run_rcon_command,
-                f"scoreboard players list {objective}", cfg
-            )
-            parts = raw.split(":", 1)[1].split(",") if ":" in raw else []
-            entries = []
-            for part in parts:
-                part = part.strip()
-                m = re.match(r"(\S+) has (-?\d+)", part)
-                if m:
-                    entries.append((m.group(1), int(m.group(2))))
-            if not entries:
+            if since is not None:
+                hit = self._history_leaderboard(guild_id, objective, count, order, offset, since)
+                if hit is None:
+                    return await ctx.send(
+                        f"ℹ️ Not enough history for `{objective}` yet; an admin can start it with `!mctrack {objective}`."
+                    )
+                rows, covered = hit
+                label = self._since_label(objective, since, since_text, covered)
+            else:
+                rows = await self._leaderboard(guild_id, objective, count, order, offset)
+                label = objective
+            if not rows:
                 return await ctx.send(f"ℹ️ No scores for `{objective}`.")
-            entries.sort(key=lambda x: x[1], reverse=True)
-
-            embed = discord.Embed(
-                title=f"🏆 Leaderboard: {objective}",
-                color=0x00ff00
+            paginator = LeaderboardPaginator(
+                label, rows, max(0, offset), ctx.author,
+                f"Requested by {ctx.author.display_name}", signed=since is not None
             )
-            for i, (name, score) in enumerate(entries[:count], start=1):
-                embed.add_field(name=f"{i}. {name}", value=str(score), inline=False)
-            await ctx.send(embed=embed)
+            if paginator.page_count == 1:
+                return await ctx.send(embed=paginator.render(0))
+            paginator.message = await ctx.send(embed=paginator.first_page(), view=paginator)
         except Exception as e:
             await ctx.send(f"⚠️ Error: {e}")
 
+    @commands.has_permissions(administrator=True)
+    @commands.command(
+        name="mctrack",
+        help="**Usage**\n"
+             "`!mctrack <objective>`\n\n"
+             "Starts recording periodic snapshots of an objective for `!mcleaderboard --since`; "
+             "*requires RCON*; admin only.\n\n"
+             "**Example**\n"
+             "`!mctrack kills`"
+    )
+    async def mctrack(self, ctx: commands.Context, objective: str = None):
+        if not objective:
+            return await ctx.send("❌ Usage: `!mctrack <objective>`")
+        if self._set_tracked(str(ctx.guild.id), objective, True):
+            await ctx.send(f"✅ Now tracking `{objective}`.")
+        else:
+            await ctx.send(f"ℹ️ `{objective}` is already tracked.")
+
+    @commands.has_permissions(administrator=True)
+    @commands.command(
+        name="mcuntrack",
+        help="**Usage**\n"
+             "`!mcuntrack <objective>`\n\n"
+             "Stops recording snapshots of an objective; admin only.\n\n"
+             "**Example**\n"
+             "`!mcuntrack kills`"
+    )
+    async def mcuntrack(self, ctx: commands.Context, objective: str = None):
+        if not objective:
+            return await ctx.send("❌ Usage: `!mcuntrack <objective>`")
+        if self._set_tracked(str(ctx.guild.id), objective, False):
+            await ctx.send(f"🗑️ Stopped tracking `{objective}`.")
+        else:
+            await ctx.send(f"ℹ️ `{objective}` isn't tracked.")
+
     #
     # --- SLASH COMMANDS ---
     #
@@ -111,11 +309,8 @@ class StatsCog(commands.Cog):
     async def mcobjs_slash(self, interaction: discord.Interaction):
         cfg = get_guild_config(self.bot, str(interaction.guild_id))
         try:
-            raw = await asyncio.get_event_loop().run_in_executor(
-                None, run_rcon_command, "scoreboard objectives list", cfg
-            )
-            objs = raw.split(":", 1)[1].split(",") if ":" in raw else []
-            names = [o.strip().split(" ", 1)[0] for o in objs]
+            raw = await rcon_command("scoreboard objectives list", cfg)
+            names = parse_objectives(raw)
             msg = f"🗒️ Objectives: {', '.join(names)}" if names else "ℹ️ No objectives found."
             await interaction.response.send_message(msg)
         except Exception as e:
@@ -134,58 +329,109 @@ class StatsCog(commands.Cog):
     ):
         cfg = get_guild_config(self.bot, str(interaction.guild_id))
         try:
-            raw = await asyncio.get_event_loop().run_in_executor(
-                None, run_rcon_command,
-                f"scoreboard players get {player} {objective}", cfg
-            )
-            m = re.search(r"(-?\d+)", raw)
-            score = m.group(1) if m else "0"
+            raw = await rcon_command(f"scoreboard players get {player} {objective}", cfg)
+            score = parse_score(raw)
+            if score is None:
+                return await interaction.response.send_message(f"ℹ️ `{player}` has no score on `{objective}`.")
             await interaction.response.send_message(f"📊 `{player}` has `{score}` on `{objective}`.")
         except Exception as e:
             await interaction.response.send_message(f"⚠️ Error: {e}", ephemeral=True)
 
+    @app_commands.command(
+        name="mcstats",
+        description="Show a player’s score on every scoreboard objective (requires RCON)."
+    )
+    @app_commands.describe(player="Player name")
+    async def mcstats_slash(self, interaction: discord.Interaction, player: str):
+        try:
+            stats = await self._player_stats(str(interaction.guild_id), player)
+            if not stats:
+                return await interaction.response.send_message(f"ℹ️ `{player}` has no scores.")
+            await interaction.response.send_message(embed=self._player_stats_embed(
+                player, stats, interaction.user.display_name
+            ))
+        except Exception as e:
+            await interaction.response.send_message(f"⚠️ Error: {e}", ephemeral=True)
+
     @app_commands.command(
         name="mcleaderboard",
         description="Show top players for a scoreboard objective (requires RCON)."
     )
     @app_commands.describe(
         objective="Objective name",
-        count="How many top entries (default 5)"
+        count=f"How many entries (default 5, max {MAX_LEADERBOARD})",
+        order="Highest (desc, default) or lowest (asc) scores first",
+        offset="Skip this many entries (default 0)",
+        since="Rank score gained over a period instead, e.g. 7d or 12h (tracked objectives only)"
     )
+    @app_commands.choices(order=[
+        app_commands.Choice(name="Highest first", value="desc"),
+        app_commands.Choice(name="Lowest first",  value="asc"),
+    ])
     async def mcleaderboard_slash(
         self,
         interaction: discord.Interaction,
         objective: str,
-        count: int = 5
+        count: int = 5,
+        order: str = "desc",
+        offset: int = 0,
+        since: str = None
     ):
-        cfg = get_guild_config(self.bot, str(interaction.guild_id))
+        guild_id = str(interaction.guild_id)
         try:
-            raw = await asyncio.get_event_loop().run_in_executor(
-                None, run_rcon_command,
-                f"scoreboard players list {objective}", cfg
-            )
-            parts = raw.split(":", 1)[1].split(",") if ":" in raw else []
-            entries = []
-            for part in parts:
-                part = part.strip()
-                m = re.match(r"(\S+) has (-?\d+)", part)
-                if m:
-                    entries.append((m.group(1), int(m.group(2))))
-            if not entries:
+            if since is not None:
+                seconds = parse_duration(since)
+                if seconds is None:
+                    return await interaction.response.send_message(
+                        "❌ `since` takes a duration like `7d`, `12h` or `1w`.", ephemeral=True
+                    )
+                hit = self._history_leaderboard(guild_id, objective, count, order, offset, seconds)
+                if hit is None:
+                    return await interaction.response.send_message(
+                        f"ℹ️ Not enough history for `{objective}` yet; an admin can start it with `/mctrack`.",
+                        ephemeral=True
+                    )
+                rows, covered = hit
+                label = self._since_label(objective, seconds, since, covered)
+            else:
+                rows = await self._leaderboard(guild_id, objective, count, order, offset)
+                label = objective
+            if not rows:
                 return await interaction.response.send_message(f"ℹ️ No scores for `{objective}`.")
-            entries.sort(key=lambda x: x[1], reverse=True)
-
-            embed = discord.Embed(
-                title=f"🏆 Leaderboard: {objective}",
-                color=0x00ff00
+            paginator = LeaderboardPaginator(
+                label, rows, max(0, offset), interaction.user,
+                interaction.user.display_name, signed=since is not None
             )
-            for i, (name, score) in enumerate(entries[:count], start=1):
-                embed.add_field(name=f"{i}. {name}", value=str(score), inline=False)
-
-            await interaction.response.send_message(embed=embed)
+            if paginator.page_count == 1:
+                return await interaction.response.send_message(embed=paginator.render(0))
+            await interaction.response.send_message(embed=paginator.first_page(), view=paginator)
+            paginator.message = await interaction.original_response()
         except Exception as e:
             await interaction.response.send_message(f"⚠️ Error: {e}", ephemeral=True)
 
+    @app_commands.command(
+        name="mctrack",
+        description="Record periodic snapshots of an objective for leaderboard history; admin only."
+    )
+    @app_commands.describe(objective="Objective name")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def mctrack_slash(self, interaction: discord.Interaction, objective: str):
+        if self._set_tracked(str(interaction.guild_id), objective, True):
+            await interaction.response.send_message(f"✅ Now tracking `{objective}`.", ephemeral=True)
+        else:
+            await interaction.response.send_message(f"ℹ️ `{objective}` is already tracked.", ephemeral=True)
+
+    @app_commands.command(
+        name="mcuntrack",
+        description="Stop recording snapshots of an objective; admin only."
+    )
+    @app_commands.describe(objective="Objective name")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def mcuntrack_slash(self, interaction: discord.Interaction, objective: str):
+        if self._set_tracked(str(interaction.guild_id), objective, False):
+            await interaction.response.send_message(f"🗑️ Stopped tracking `{objective}`.", ephemeral=True)
+        else:
+            await interaction.response.send_message(f"ℹ️ `{objective}` isn't tracked.", ephemeral=True)
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(StatsCog(bot))
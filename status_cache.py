@@ -0,0 +1,54 @@
+import asyncio
+import os
+import time
+from mcstatus import JavaServer
+
+from breaker import status_breakers
+from limits import run_status
+
+STATUS_TTL = float(os.getenv("MC_STATUS_TTL", "5"))
+
+
+class StatusCache:
+    """Short-lived cache of JavaServer.status() results keyed by (ip, port).
+
+    Concurrent lookups for the same server share a single in-flight ping.
+    """
+
+    def __init__(self, ttl: float = STATUS_TTL):
+        self.ttl = ttl
+        self._entries  = {}   # (ip, port) -> (expires_at, status)
+        self._inflight = {}   # (ip, port) -> Task
+
+    async def _fetch(self, key):
+        srv = JavaServer(*key)
+        with status_breakers.guard(key):
+            st = await run_status("status", key, srv.status)
+        self._entries[key] = (time.monotonic() + self.ttl, st)
+        return st
+
+    def _done(self, key, task):
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            task.exception()   # mark as retrieved even if every waiter went away
+
+    def get_cached(self, ip: str, port: int):
+        hit = self._entries.get((ip, port))
+        if hit and hit[0] > time.monotonic():
+            return hit[1]
+        return None
+
+    async def status(self, ip: str, port: int):
+        key = (ip, port)
+        st = self.get_cached(ip, port)
+        if st is not None:
+            return st
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        # shield so one caller timing out doesn't cancel the ping for everyone else
+        return await asyncio.shield(task)
+
+status_cache = StatusCache()
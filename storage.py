@@ -0,0 +1,262 @@
+import asyncio
+import json
+import os
+import sqlite3
+from collections.abc import MutableMapping
+
+from utils import load_json
+
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "json").lower()
+SQLITE_PATH     = os.getenv("SQLITE_PATH", "bot.db")
+# how often to check whether another process (shard worker) committed changes
+SQLITE_REFRESH_INTERVAL = float(os.getenv("SQLITE_REFRESH_INTERVAL", "2"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS guild_configs (
+    guild_id TEXT NOT NULL,
+    key      TEXT NOT NULL,
+    value    TEXT NOT NULL,
+    PRIMARY KEY (guild_id, key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS waypoints (
+    guild_id TEXT    NOT NULL,
+    name     TEXT    NOT NULL,
+    x        INTEGER NOT NULL,
+    y        INTEGER,
+    z        INTEGER NOT NULL,
+    added_by INTEGER NOT NULL,
+    added_at TEXT    NOT NULL,
+    PRIMARY KEY (guild_id, name)
+) WITHOUT ROWID;
+"""
+
+# constant SQL strings so sqlite3's per-connection statement cache reuses the prepared statements
+SQL_WP_GET      = "SELECT x, y, z, added_by, added_at FROM waypoints WHERE guild_id = ? AND name = ?"
+SQL_WP_HAS      = "SELECT 1 FROM waypoints WHERE guild_id = ? AND name = ?"
+SQL_WP_PUT      = ("INSERT OR REPLACE INTO waypoints (guild_id, name, x, y, z, added_by, added_at) "
+                   "VALUES (?, ?, ?, ?, ?, ?, ?)")
+SQL_WP_DEL      = "DELETE FROM waypoints WHERE guild_id = ? AND name = ?"
+SQL_WP_NAMES    = "SELECT name FROM waypoints WHERE guild_id = ? ORDER BY name"
+SQL_WP_ITEMS    = "SELECT name, x, y, z, added_by, added_at FROM waypoints WHERE guild_id = ? ORDER BY name"
+SQL_WP_COUNT    = "SELECT COUNT(*) FROM waypoints WHERE guild_id = ?"
+SQL_WP_CLEAR    = "DELETE FROM waypoints WHERE guild_id = ?"
+SQL_WP_GUILDS   = "SELECT DISTINCT guild_id FROM waypoints"
+SQL_CFG_GET     = "SELECT key, value FROM guild_configs WHERE guild_id = ?"
+SQL_CFG_PUT     = "INSERT OR REPLACE INTO guild_configs (guild_id, key, value) VALUES (?, ?, ?)"
+SQL_CFG_DEL     = "DELETE FROM guild_configs WHERE guild_id = ? AND key = ?"
+SQL_CFG_CLEAR   = "DELETE FROM guild_configs WHERE guild_id = ?"
+SQL_CFG_GUILDS  = "SELECT DISTINCT guild_id FROM guild_configs"
+
+
+def _waypoint_row(guild_id, name, r):
+    return (guild_id, name, r["x"], r.get("y"), r["z"], r["added_by"], r["added_at"])
+
+
+class GuildWaypoints(MutableMapping):
+    """Write-through view of one guild's waypoints."""
+
+    def __init__(self, db: sqlite3.Connection, guild_id: str):
+        self.db = db
+        self.guild_id = guild_id
+
+    def __getitem__(self, name):
+        row = self.db.execute(SQL_WP_GET, (self.guild_id, name)).fetchone()
+        if row is None:
+            raise KeyError(name)
+        x, y, z, added_by, added_at = row
+        return {"x": x, "y": y, "z": z, "added_by": added_by, "added_at": added_at}
+
+    def __contains__(self, name):
+        return self.db.execute(SQL_WP_HAS, (self.guild_id, name)).fetchone() is not None
+
+    def __setitem__(self, name, record):
+        with self.db:
+            self.db.execute(SQL_WP_PUT, _waypoint_row(self.guild_id, name, record))
+
+    def __delitem__(self, name):
+        with self.db:
+            cur = self.db.execute(SQL_WP_DEL, (self.guild_id, name))
+        if cur.rowcount == 0:
+            raise KeyError(name)
+
+    def __iter__(self):
+        return (name for (name,) in self.db.execute(SQL_WP_NAMES, (self.guild_id,)).fetchall())
+
+    def __len__(self):
+        return self.db.execute(SQL_WP_COUNT, (self.guild_id,)).fetchone()[0]
+
+    def items(self):
+        return [
+            (name, {"x": x, "y": y, "z": z, "added_by": added_by, "added_at": added_at})
+            for name, x, y, z, added_by, added_at
+            in self.db.execute(SQL_WP_ITEMS, (self.guild_id,)).fetchall()
+        ]
+
+    def update(self, other=(), **kwargs):
+        rows = dict(other, **kwargs)
+        with self.db:
+            self.db.executemany(
+                SQL_WP_PUT, (_waypoint_row(self.guild_id, n, r) for n, r in rows.items())
+            )
+
+    def clear(self):
+        with self.db:
+            self.db.execute(SQL_WP_CLEAR, (self.guild_id,))
+
+
+class SqliteWaypoints(MutableMapping):
+    """guild_id -> GuildWaypoints; every guild reads as present (possibly empty)."""
+
+    def __init__(self, db: sqlite3.Connection):
+        self.db = db
+
+    def __getitem__(self, guild_id):
+        return GuildWaypoints(self.db, guild_id)
+
+    def __setitem__(self, guild_id, records):
+        wps = GuildWaypoints(self.db, guild_id)
+        wps.clear()
+        wps.update(records)
+
+    def __delitem__(self, guild_id):
+        GuildWaypoints(self.db, guild_id).clear()
+
+    def __iter__(self):
+        return (g for (g,) in self.db.execute(SQL_WP_GUILDS).fetchall())
+
+    def __len__(self):
+        return len(self.db.execute(SQL_WP_GUILDS).fetchall())
+
+
+class GuildConfig(MutableMapping):
+    """Write-through view of one guild's config; values are kept in memory after the first read."""
+
+    def __init__(self, db: sqlite3.Connection, guild_id: str, values: dict):
+        self.db = db
+        self.guild_id = guild_id
+        self._values = values
+
+    def __getitem__(self, key):
+        return self._values[key]
+
+    def __setitem__(self, key, value):
+        with self.db:
+            self.db.execute(SQL_CFG_PUT, (self.guild_id, key, json.dumps(value)))
+        self._values[key] = value
+
+    def __delitem__(self, key):
+        with self.db:
+            self.db.execute(SQL_CFG_DEL, (self.guild_id, key))
+        del self._values[key]
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+
+class SqliteConfigs(MutableMapping):
+    """guild_id -> GuildConfig; get_prefix hits this on every message, so rows are cached."""
+
+    def __init__(self, db: sqlite3.Connection):
+        self.db = db
+        self._cache = {}
+
+    def __getitem__(self, guild_id):
+        cfg = self._cache.get(guild_id)
+        if cfg is None:
+            values = {k: json.loads(v) for k, v in self.db.execute(SQL_CFG_GET, (guild_id,))}
+            cfg = self._cache[guild_id] = GuildConfig(self.db, guild_id, values)
+        return cfg
+
+    def __setitem__(self, guild_id, values):
+        cfg = self[guild_id]
+        cfg.clear()
+        cfg.update(values)
+
+    def __delitem__(self, guild_id):
+        with self.db:
+            self.db.execute(SQL_CFG_CLEAR, (guild_id,))
+        self._cache.pop(guild_id, None)
+
+    def __iter__(self):
+        return (g for (g,) in self.db.execute(SQL_CFG_GUILDS).fetchall())
+
+    def __len__(self):
+        return len(self.db.execute(SQL_CFG_GUILDS).fetchall())
+
+    def invalidate(self):
+        self._cache.clear()
+
+
+class SqliteStorage:
+    """SQLite (WAL) backend for bot.server_configs / bot.all_waypoints.
+
+    Every mutation is committed as it happens, so mark_dirty/flush are no-ops
+    kept for interface parity with WriteBehindStore. Several bot processes can
+    share one database: PRAGMA data_version is polled and the config cache is
+    dropped whenever another connection has committed.
+    """
+
+    def __init__(self, path: str = SQLITE_PATH, refresh_interval: float = SQLITE_REFRESH_INTERVAL):
+        self.db = sqlite3.connect(path, timeout=10)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        self.configs   = SqliteConfigs(self.db)
+        self.waypoints = SqliteWaypoints(self.db)
+        self.refresh_interval = refresh_interval
+        self._data_version = self._read_data_version()
+        self._task = None
+
+    def _read_data_version(self) -> int:
+        return self.db.execute("PRAGMA data_version").fetchone()[0]
+
+    def refresh(self) -> bool:
+        """Drop cached configs if another connection committed since the last check."""
+        version = self._read_data_version()
+        if version == self._data_version:
+            return False
+        self._data_version = version
+        self.configs.invalidate()
+        return True
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            self.refresh()
+
+    def migrate_json(self, cfg_path: str, wp_path: str):
+        if self.db.execute("SELECT 1 FROM meta WHERE key = 'json_migrated'").fetchone():
+            return
+        with self.db:
+            for guild_id, raw in load_json(cfg_path).items():
+                self.db.executemany(
+                    SQL_CFG_PUT, ((guild_id, k, json.dumps(v)) for k, v in raw.items())
+                )
+            for guild_id, wps in load_json(wp_path).items():
+                self.db.executemany(
+                    SQL_WP_PUT, (_waypoint_row(guild_id, n, r) for n, r in wps.items())
+                )
+            self.db.execute("INSERT INTO meta (key, value) VALUES ('json_migrated', '1')")
+
+    def mark_dirty(self, path: str):
+        pass
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def flush_sync(self):
+        pass
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self.db.close()
@@ -0,0 +1,38 @@
+from history import ObjectiveHistory, parse_duration
+
+HOUR = 3600
+
+
+def hourly(hours: int, now: float = 1_000_000.0) -> ObjectiveHistory:
+    """One snapshot an hour for `hours` hours up to `now`; Steve gains 10 an hour."""
+    h = ObjectiveHistory()
+    for k in range(hours, -1, -1):
+        h.record(now - k * HOUR, [("Steve", (hours - k) * 10)])
+    return h
+
+
+def test_baseline_is_the_last_snapshot_at_or_before_since():
+    now = 1_000_000.0
+    h = hourly(48, now)
+    assert h.deltas(now - HOUR) == (HOUR, [("Steve", 10)])
+    assert h.deltas(now - 2 * HOUR) == (2 * HOUR, [("Steve", 20)])
+    # between snapshots the older one is the baseline, and the span says so
+    assert h.deltas(now - 90 * 60) == (2 * HOUR, [("Steve", 20)])
+
+
+def test_history_shorter_than_since_covers_what_there_is():
+    now = 1_000_000.0
+    h = hourly(3, now)
+    assert h.deltas(now - 7 * 86400) == (3 * HOUR, [("Steve", 30)])
+
+
+def test_no_baseline_before_the_latest_snapshot():
+    now = 1_000_000.0
+    assert hourly(0, now).deltas(now - HOUR) is None
+    assert hourly(5, now).deltas(now + 60) is None   # nothing newer than the baseline
+
+
+def test_parse_duration():
+    assert parse_duration("1w2d") == 9 * 86400
+    assert parse_duration("12h") == 12 * HOUR
+    assert parse_duration("12x") is None
@@ -0,0 +1,62 @@
+import asyncio
+import threading
+
+import limits
+from limits import ServerBusy, ServerLimiter
+
+
+def test_limit_holds_while_earlier_callers_finish():
+    async def run():
+        limiter = ServerLimiter("test", 2, 10)
+        running = peak = 0
+
+        async def call(delay, start=0.0):
+            nonlocal running, peak
+            await asyncio.sleep(start)
+            async with limiter.slot("srv"):
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(delay)
+                running -= 1
+
+        # the short call finishes while the long one still runs; the late call must still queue
+        await asyncio.gather(call(0.01), call(0.05), call(0.05, start=0.02), call(0.05, start=0.02))
+        return limiter, peak
+
+    limiter, peak = asyncio.run(run())
+    assert peak == 2
+    assert limiter._slots == {}
+
+
+def test_rejects_past_the_queue_bound():
+    async def run():
+        limiter = ServerLimiter("test", 1, 1)
+
+        async def call():
+            async with limiter.slot("srv"):
+                await asyncio.sleep(0.02)
+
+        return await asyncio.gather(call(), call(), call(), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert [type(r) for r in results] == [type(None), type(None), ServerBusy]
+
+
+def test_cancelled_status_call_keeps_its_slot_until_the_thread_returns():
+    async def run():
+        release = threading.Event()
+        task = asyncio.create_task(limits.run_status("test", "srv", release.wait, 5))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.sleep(0.05)
+        held = limits.status_limiter._slots["srv"].active
+        release.set()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        return held, "srv" in limits.status_limiter._slots
+
+    held, still_there = asyncio.run(run())
+    assert held == 1
+    assert not still_there
@@ -0,0 +1,239 @@
+import asyncio
+import struct
+
+import pytest
+
+from rcon import (
+    TYPE_AUTH_RESPONSE, TYPE_COMMAND, TYPE_LOGIN, TYPE_RESPONSE,
+    AsyncRcon, RconClients, RconError, RconTimeout, RconUnreachable, encode_packet,
+)
+
+FRAGMENT = 4096
+
+
+class VanillaRcon:
+    """RCON server that reads the way vanilla's RconClient does: one read per packet,
+    dropping the connection when a read holds anything but exactly one packet."""
+
+    def __init__(self, password="pw", latency=0.02, drop_once=()):
+        self.password = password
+        self.latency = latency
+        self.drop_once = set(drop_once)   # commands that kill the connection the first time they run
+        self.reads = []
+        self.commands = []
+        self.rejected = 0
+        self.connections = 0
+        self.muted = set()   # connection numbers that stop answering, like one dropped by a NAT
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        conn = self.connections
+        try:
+            while True:
+                data = await reader.read(1460)
+                if not data:
+                    return
+                self.reads.append(data)
+                (length,) = struct.unpack("<i", data[:4])
+                if length != len(data) - 4:
+                    self.rejected += 1
+                    return
+                req_id, ptype = struct.unpack("<ii", data[4:12])
+                body = data[12:-2].decode("utf8")
+                if ptype == TYPE_LOGIN:
+                    ok = body == self.password
+                    writer.write(encode_packet(req_id if ok else -1, TYPE_AUTH_RESPONSE, ""))
+                elif conn in self.muted:
+                    continue
+                elif ptype == TYPE_COMMAND:
+                    if body:
+                        self.commands.append(body)
+                    if body in self.drop_once:
+                        self.drop_once.discard(body)
+                        return
+                    # the command runs on the server thread
+                    await asyncio.sleep(1 if body == "slow" else self.latency)
+                    reply = {"long": "x" * 10000, "exact": "y" * 2 * FRAGMENT}.get(body, f"ran {body}")
+                    for i in range(0, max(len(reply), 1), FRAGMENT):
+                        writer.write(encode_packet(req_id, TYPE_RESPONSE, reply[i:i + FRAGMENT]))
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+def test_each_packet_in_its_own_read():
+    async def run():
+        server = await VanillaRcon().start()
+        client = AsyncRcon("127.0.0.1", server.port, "pw", timeout=5)
+        try:
+            await client.connect()
+            replies = await client.batch(["list", "long", "exact", "time query daytime"])
+            single = await client.command("list")
+        finally:
+            await client.close()
+            await server.stop()
+        return server, replies, single
+
+    server, replies, single = asyncio.run(run())
+    assert server.rejected == 0
+    assert replies == ["ran list", "x" * 10000, "y" * 2 * FRAGMENT, "ran time query daytime"]
+    assert single == "ran list"
+    # login, one read per command, and an end marker at least for the reply made of full fragments
+    assert 1 + 5 + 1 <= len(server.reads) <= 1 + 5 + 2
+
+
+def test_timeout_leaves_no_state_behind():
+    async def run():
+        server = await VanillaRcon(latency=0.5).start()
+        client = AsyncRcon("127.0.0.1", server.port, "pw", timeout=0.1)
+        try:
+            await client.connect()
+            try:
+                await client.command("list")
+            except Exception as e:
+                err = e
+        finally:
+            await client.close()
+            await server.stop()
+        return client, err
+
+    client, err = asyncio.run(run())
+    assert type(err) is RconUnreachable
+    assert not client._markers and not client._acks and not client._pending
+
+
+async def _run_with_drop(cmd):
+    server = await VanillaRcon(drop_once={cmd}).start()
+    clients = RconClients(timeout=5)
+    try:
+        await clients.command("list", "127.0.0.1", server.port, "pw")   # open the pooled connection
+        try:
+            return server, await clients.command(cmd, "127.0.0.1", server.port, "pw")
+        except RconError as e:
+            return server, e
+    finally:
+        await clients.close()
+        await server.stop()
+
+
+def test_read_only_command_is_retried_after_a_drop():
+    server, reply = asyncio.run(_run_with_drop("seed"))
+    assert reply == "ran seed"
+    assert server.commands == ["list", "seed", "seed"]
+
+
+@pytest.mark.parametrize("cmd", ["stop", "scoreboard players set Steve kills 1"])
+def test_command_that_reached_the_server_is_not_resent(cmd):
+    server, reply = asyncio.run(_run_with_drop(cmd))
+    assert isinstance(reply, RconError)
+    assert server.commands == ["list", cmd]
+
+
+def test_client_against_the_fake_server():
+    from benchmarks.fakes import FakeMinecraftServer
+
+    async def run():
+        server = await FakeMinecraftServer(scoreboard_entries=2000, latency=0.01).start()
+        client = AsyncRcon(server.host, server.port, server.password, timeout=5)
+        try:
+            await client.connect()
+            replies = await client.batch(["list", "scoreboard players list obj_1", "seed"])
+        finally:
+            await client.close()
+        # the same two packets in one write, as the old pipelined client sent them
+        reader, writer = await asyncio.open_connection(server.host, server.port)
+        writer.write(encode_packet(1, TYPE_LOGIN, server.password))
+        await writer.drain()
+        await reader.readexactly(14)
+        writer.write(encode_packet(2, TYPE_COMMAND, "list") + encode_packet(3, TYPE_COMMAND, ""))
+        await writer.drain()
+        dropped = await reader.read() == b""
+        writer.close()
+        await server.stop()
+        return server, replies, dropped
+
+    server, replies, dropped = asyncio.run(run())
+    assert replies[0].startswith("There are 8 of a max of 100 players online")
+    assert replies[1].startswith("Showing 2000 tracked entities") and len(replies[1]) > 2 * 4096
+    assert replies[2] == "Seed: [-4172144997902289642]"
+    assert dropped and server.rcon_rejected == 1
+
+
+def test_long_batch_is_timed_per_packet_and_spread_over_connections():
+    async def run():
+        server = await VanillaRcon(latency=0.01).start()
+        clients = RconClients(timeout=0.3, per_server=4)
+        try:
+            # ~1.2 s of round trips in total, but no single packet comes near the timeout
+            replies = await clients.batch([f"get {i}" for i in range(120)], "127.0.0.1", server.port, "pw")
+        finally:
+            await clients.close()
+            await server.stop()
+        return server, replies
+
+    server, replies = asyncio.run(run())
+    assert replies == [f"ran get {i}" for i in range(120)]
+    assert server.connections == 4
+
+
+def test_timeout_on_a_server_that_is_answering_is_not_unreachable():
+    async def run():
+        server = await VanillaRcon().start()
+        client = AsyncRcon("127.0.0.1", server.port, "pw", timeout=0.3)
+        try:
+            await client.connect()
+            try:
+                await client.batch(["list", "slow"])
+            except RconError as e:
+                return e
+        finally:
+            await client.close()
+            await server.stop()
+
+    err = asyncio.run(run())
+    assert isinstance(err, RconTimeout) and not isinstance(err, RconUnreachable)
+
+
+def test_silently_dropped_connection_is_replaced_before_reuse():
+    async def run():
+        server = await VanillaRcon().start()
+        clients = RconClients(timeout=5, probe_after=0, probe_timeout=0.1)
+        try:
+            await clients.command("list", "127.0.0.1", server.port, "pw")
+            server.muted.add(1)
+            reply = await clients.command("seed", "127.0.0.1", server.port, "pw")
+        finally:
+            await clients.close()
+            await server.stop()
+        return server, reply
+
+    server, reply = asyncio.run(run())
+    assert reply == "ran seed"
+    assert server.connections == 2 and server.commands == ["list", "seed"]
+
+
+def test_idle_connections_are_closed():
+    async def run():
+        server = await VanillaRcon().start()
+        clients = RconClients(timeout=5, idle_timeout=0.05)
+        try:
+            await clients.command("list", "127.0.0.1", server.port, "pw")
+            first = clients._clients[("127.0.0.1", server.port, "pw")][0]
+            await asyncio.sleep(0.1)
+            await clients.command("list", "127.0.0.1", server.port, "pw")
+        finally:
+            await clients.close()
+            await server.stop()
+        return server, first
+
+    server, first = asyncio.run(run())
+    assert first.closed and server.connections == 2
@@ -0,0 +1,36 @@
+from waypoint_table import WaypointTable, WaypointTables
+
+
+def test_record_missing_a_field_is_spilled():
+    tables = WaypointTables({"g": {
+        "old": {"x": 1, "y": None, "z": 2, "added_at": "01/01/25"},
+        "new": {"x": 3, "y": 64, "z": 4, "added_by": 5, "added_at": "01/02/25"},
+    }})
+    table = tables["g"]
+    assert table["old"] == {"x": 1, "y": None, "z": 2, "added_at": "01/01/25"}
+    assert table["new"] == {"x": 3, "y": 64, "z": 4, "added_by": 5, "added_at": "01/02/25"}
+    assert list(table._spill) == ["old"]
+
+
+def test_every_way_in_converts_to_a_table():
+    tables = WaypointTables()
+    tables["a"] = {}
+    tables.update({"b": {}})
+    tables.update(c={})
+    tables |= {"d": {}}
+    tables.setdefault("e")
+    assert all(isinstance(t, WaypointTable) for t in tables.values())
+    assert list(tables) == ["a", "b", "c", "d", "e"]
+
+
+def test_snapshot_is_unaffected_by_later_changes():
+    table = WaypointTable({
+        "a": {"x": 1, "y": None, "z": 2, "added_by": 5, "added_at": "01/01/25"},
+        "far": {"x": 2**40, "y": 64, "z": 2, "added_by": 5, "added_at": "01/01/25"},
+    })
+    before = dict(table.items())
+    snap = table.snapshot()
+    table["b"] = {"x": 3, "y": 64, "z": 4, "added_by": 6, "added_at": "01/02/25"}
+    del table["a"]
+    table["far"] = {"x": 2**41, "y": 64, "z": 2, "added_by": 5, "added_at": "01/01/25"}
+    assert dict(snap) == before
@@ -0,0 +1,42 @@
+from waypoint_table import WaypointTables
+from waypoints import RENDER_GUILDS, WaypointCog, WaypointPaginator
+
+
+class FakeStore:
+    def mark_dirty(self, path):
+        pass
+
+
+class FakeBot:
+    def __init__(self, guilds: int, per_guild: int):
+        self.store = FakeStore()
+        self.all_waypoints = WaypointTables({
+            str(g): {f"wp {i}": {"x": i, "y": None, "z": -i, "added_by": 1, "added_at": "01/01/25"}
+                     for i in range(per_guild)}
+            for g in range(guilds)
+        })
+
+
+def test_list_renders_only_the_pages_shown():
+    bot = FakeBot(1, 100)
+    cog = WaypointCog(bot)
+    wps = bot.all_waypoints["0"]
+    paginator = WaypointPaginator(cog._list_cache("0", wps), wps, None, "footer")
+    assert paginator.page_count == 20
+    assert paginator.render(0).fields[0].name == "Wp 0"
+    assert list(paginator.cache.pages) == [0]
+
+    # a removal after the list opened doesn't shift its pages
+    cog._delete_waypoint("0", "wp 95")
+    last = paginator.render(19).fields
+    assert [f.name for f in last] == ["Wp 95", "Wp 96", "Wp 97", "Wp 98", "Wp 99"]
+    assert last[0].value == "*removed*"
+
+
+def test_render_cache_is_bounded_across_guilds():
+    bot = FakeBot(RENDER_GUILDS + 5, 3)
+    cog = WaypointCog(bot)
+    for guild_id, wps in bot.all_waypoints.items():
+        cog._list_cache(guild_id, wps)
+    assert len(cog._renders) == RENDER_GUILDS
+    assert "0" not in cog._renders and str(RENDER_GUILDS + 4) in cog._renders
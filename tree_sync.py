@@ -0,0 +1,50 @@
+import hashlib
+import json
+import logging
+
+import discord
+from discord import app_commands
+
+from utils import load_json, save_json
+
+TREE_HASH_PATH = "tree_hashes.json"
+
+log = logging.getLogger(__name__)
+
+
+def _payload(cmd, tree: app_commands.CommandTree) -> dict:
+    try:
+        return cmd.to_dict(tree)
+    except TypeError:   # discord.py < 2.4: to_dict() takes no tree
+        return cmd.to_dict()
+
+
+def tree_hash(tree: app_commands.CommandTree, guild: discord.abc.Snowflake = None) -> str:
+    """Stable sha256 of the payload tree.sync(guild=guild) would upload."""
+    payloads = sorted(
+        (_payload(cmd, tree) for cmd in tree.get_commands(guild=guild)),
+        key=lambda p: (p.get("type", 1), p["name"])
+    )
+    raw = json.dumps(payloads, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode("utf8")).hexdigest()
+
+
+async def sync_if_changed(
+    tree: app_commands.CommandTree,
+    application_id: int,
+    guild: discord.abc.Snowflake = None,
+    force: bool = False,
+    path: str = TREE_HASH_PATH,
+) -> bool:
+    """Sync the global (or one guild's) tree only when its hash differs from the last sync."""
+    scope  = f"{application_id}:{guild.id if guild else 'global'}"
+    digest = tree_hash(tree, guild)
+    hashes = load_json(path)
+    if not force and hashes.get(scope) == digest:
+        log.info("Command tree %s unchanged; skipping sync", scope)
+        return False
+    await tree.sync(guild=guild)
+    hashes[scope] = digest
+    save_json(path, hashes)
+    log.info("Synced command tree %s", scope)
+    return True
@@ -1,7 +1,6 @@
 import os
 import json
 from dotenv import load_dotenv
-from mcrcon import MCRcon
 
 load_dotenv()
 
@@ -18,25 +17,42 @@ def load_json(path: str):
         return json.load(open(path))
     return {}
 
+def write_atomic(path: str, text: str):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
 def save_json(path: str, data):
-    json.dump(data, open(path, "w"), indent=4)
+    write_atomic(path, json.dumps(data, indent=4))
 
 async def get_prefix(bot, message):
     if not message.guild:
         return DEFAULT_PREFIX
     return bot.server_configs.get(str(message.guild.id), {}).get("prefix", DEFAULT_PREFIX)
 
-def get_guild_config(bot, guild_id: str):
+DEFAULT_PROFILE = "default"
+
+def get_guild_config(bot, guild_id: str, profile: str = None):
+    """ip/port/password for the guild's default server, or for a named profile (None if unknown)."""
     raw = bot.server_configs.get(guild_id, {})
+    if profile and profile.lower() != DEFAULT_PROFILE:
+        raw = raw.get("servers", {}).get(profile.lower())
+        if raw is None:
+            return None
     return {
         "ip":       raw.get("ip",       DEFAULT_IP),
         "port":     raw.get("port",     DEFAULT_PORT),
         "password": raw.get("password", DEFAULT_RCON_PASSWORD),
     }
 
-def run_rcon_command(cmd: str, cfg: dict) -> str:
-    ip, port, pw = cfg["ip"], cfg["port"], cfg["password"]
-    if not pw:
-        raise RuntimeError("RCON password not set for this server.")
-    with MCRcon(ip, pw, port=port) as mcr:
-        return mcr.command(cmd)
+def server_profiles(bot, guild_id: str) -> dict:
+    """Every configured server of a guild: the default one first (if its IP was set), then named
+    profiles. Unlike get_guild_config, nothing falls back to DEFAULT_IP here."""
+    raw = bot.server_configs.get(guild_id, {})
+    profiles = {DEFAULT_PROFILE: get_guild_config(bot, guild_id)} if raw.get("ip") else {}
+    for name in raw.get("servers", {}):
+        profiles[name] = get_guild_config(bot, guild_id, name)
+    return profiles
@@ -0,0 +1,192 @@
+import bisect
+import difflib
+import heapq
+import math
+
+REGION_SIZE = 512   # grid cell edge in blocks; one Minecraft region file
+FUZZY_POOL  = 2000  # most names difflib is asked to compare per keystroke
+
+
+class SpatialGrid:
+    """Uniform grid over waypoint (x, z) coordinates, bucketed by region."""
+
+    def __init__(self, cell: int = REGION_SIZE):
+        self.cell   = cell
+        self.cells  = {}   # (cx, cz) -> {name: (x, z)}
+        self.points = {}   # name -> (x, z)
+
+    def __len__(self):
+        return len(self.points)
+
+    def _cell_of(self, x, z):
+        return (x // self.cell, z // self.cell)
+
+    def add(self, name: str, x: int, z: int):
+        if name in self.points:
+            self.remove(name)
+        self.points[name] = (x, z)
+        self.cells.setdefault(self._cell_of(x, z), {})[name] = (x, z)
+
+    def remove(self, name: str):
+        pos = self.points.pop(name, None)
+        if pos is None:
+            return
+        key = self._cell_of(*pos)
+        bucket = self.cells[key]
+        del bucket[name]
+        if not bucket:
+            del self.cells[key]
+
+    def within_box(self, x1: int, z1: int, x2: int, z2: int):
+        """Names inside the inclusive box, sorted by name."""
+        x1, x2 = min(x1, x2), max(x1, x2)
+        z1, z2 = min(z1, z2), max(z1, z2)
+        (cx1, cz1), (cx2, cz2) = self._cell_of(x1, z1), self._cell_of(x2, z2)
+        found = []
+        if (cx2 - cx1 + 1) * (cz2 - cz1 + 1) > len(self.cells):
+            # box spans more cells than are occupied: walk the occupied ones instead
+            candidates = (
+                b for (cx, cz), b in self.cells.items()
+                if cx1 <= cx <= cx2 and cz1 <= cz <= cz2
+            )
+        else:
+            candidates = (
+                self.cells[(cx, cz)]
+                for cx in range(cx1, cx2 + 1) for cz in range(cz1, cz2 + 1)
+                if (cx, cz) in self.cells
+            )
+        for bucket in candidates:
+            for name, (x, z) in bucket.items():
+                if x1 <= x <= x2 and z1 <= z <= z2:
+                    found.append(name)
+        found.sort()
+        return found
+
+    def within_radius(self, x: int, z: int, radius: float):
+        """(distance, name) pairs within radius of (x, z), nearest first."""
+        r2 = radius * radius
+        found = []
+        for name in self.within_box(
+            math.floor(x - radius), math.floor(z - radius),
+            math.ceil(x + radius), math.ceil(z + radius)
+        ):
+            px, pz = self.points[name]
+            d2 = (px - x) ** 2 + (pz - z) ** 2
+            if d2 <= r2:
+                found.append((math.sqrt(d2), name))
+        found.sort()
+        return found
+
+    def nearest(self, x: int, z: int, k: int):
+        """The k closest (distance, name) pairs to (x, z), nearest first."""
+        if k <= 0 or not self.points:
+            return []
+        cx0, cz0 = self._cell_of(x, z)
+        best = []   # max-heap of (-d2, name), size <= k
+        seen_cells = 0
+        ring = 0
+        while seen_cells < len(self.cells):
+            # anything in this ring or beyond is at least (ring - 1) cells away
+            if len(best) == k and -best[0][0] <= (max(ring - 1, 0) * self.cell) ** 2:
+                break
+            if (2 * ring + 1) ** 2 > 4 * len(self.cells):
+                # sparse outliers: cheaper to scan the remaining occupied cells directly
+                ring_cells = [
+                    c for c in self.cells
+                    if max(abs(c[0] - cx0), abs(c[1] - cz0)) >= ring
+                ]
+            else:
+                ring_cells = self._ring(cx0, cz0, ring)
+            for key in ring_cells:
+                bucket = self.cells.get(key)
+                if bucket is None:
+                    continue
+                seen_cells += 1
+                for name, (px, pz) in bucket.items():
+                    d2 = (px - x) ** 2 + (pz - z) ** 2
+                    if len(best) < k:
+                        heapq.heappush(best, (-d2, name))
+                    elif d2 < -best[0][0]:
+                        heapq.heapreplace(best, (-d2, name))
+            ring += 1
+        return sorted((math.sqrt(-nd2), name) for nd2, name in best)
+
+    @staticmethod
+    def _ring(cx0, cz0, ring):
+        if ring == 0:
+            return [(cx0, cz0)]
+        cells = []
+        for dx in range(-ring, ring + 1):
+            cells.append((cx0 + dx, cz0 - ring))
+            cells.append((cx0 + dx, cz0 + ring))
+        for dz in range(-ring + 1, ring):
+            cells.append((cx0 - ring, cz0 + dz))
+            cells.append((cx0 + ring, cz0 + dz))
+        return cells
+
+
+class NameIndex:
+    """Sorted (word, name) index for prefix lookups on whole names and on each word."""
+
+    def __init__(self, names=()):
+        self._keys = sorted(key for name in names for key in self._keys_for(name))
+
+    @staticmethod
+    def _keys_for(name: str):
+        keys = {(name, name)}
+        for word in name.split()[1:]:
+            keys.add((word, name))
+        return keys
+
+    def add(self, name: str):
+        for key in self._keys_for(name):
+            i = bisect.bisect_left(self._keys, key)
+            if i == len(self._keys) or self._keys[i] != key:
+                self._keys.insert(i, key)
+
+    def update(self, names):
+        """Add many names with one merge instead of an O(n) insert per key."""
+        new = sorted(key for name in names for key in self._keys_for(name))
+        merged = sorted(self._keys + new)   # two sorted runs: a linear merge
+        self._keys = [key for i, key in enumerate(merged) if i == 0 or merged[i - 1] != key]
+
+    def remove(self, name: str):
+        for key in self._keys_for(name):
+            i = bisect.bisect_left(self._keys, key)
+            if i < len(self._keys) and self._keys[i] == key:
+                del self._keys[i]
+
+    def _range(self, prefix: str):
+        lo = bisect.bisect_left(self._keys, (prefix,))
+        hi = bisect.bisect_left(self._keys, (prefix + "\U0010ffff",))
+        return lo, hi
+
+    def search(self, query: str, limit: int = 25):
+        """Names starting with query (or with a word starting with it), then close matches."""
+        results = []
+        seen = set()
+        lo, hi = self._range(query)
+        for word, name in self._keys[lo:hi]:
+            if name not in seen:
+                seen.add(name)
+                results.append(name)
+                if len(results) >= limit:
+                    return results
+        if not query:
+            return results
+        # fuzzy fallback, restricted to keys sharing the first letter so typos stay cheap
+        lo, hi = self._range(query[0])
+        matcher = difflib.SequenceMatcher(b=query)
+        scored = []
+        for word, name in self._keys[lo:min(hi, lo + FUZZY_POOL)]:
+            # compare against a same-length prefix: the user is still typing
+            matcher.set_seq1(word[:len(query) + 1])
+            if matcher.real_quick_ratio() >= 0.6 and matcher.ratio() >= 0.6:
+                scored.append((matcher.ratio(), name))
+        for _, name in heapq.nlargest(limit, scored):
+            if name not in seen:
+                seen.add(name)
+                results.append(name)
+                if len(results) >= limit:
+                    break
+        return results
@@ -0,0 +1,192 @@
+import codecs
+import csv
+import io
+import json
+from tempfile import SpooledTemporaryFile
+
+MAX_IMPORT_BYTES = 5 * 1024 * 1024
+MAX_NAME_LEN     = 100
+COORD_LIMIT      = 30_000_000   # world border
+Y_LIMIT          = 4096
+BATCH_SIZE       = 500
+EXPORT_FORMATS   = ("jsonl", "csv")
+CSV_FIELDS       = ("name", "x", "y", "z", "added_by", "added_at")
+
+
+class RowError(ValueError):
+    pass
+
+
+#
+# --- PARSERS: each yields (line_no, {"name", "x", "y", "z"}) or (line_no, RowError) ---
+#
+
+def parse_jsonl(lines):
+    for no, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield no, RowError("not valid JSON")
+            continue
+        yield no, row if isinstance(row, dict) else RowError("expected a JSON object")
+
+
+def parse_csv(lines):
+    reader = csv.DictReader(lines)
+    if not reader.fieldnames or not {"name", "x", "z"} <= {f.strip().lower() for f in reader.fieldnames}:
+        yield 1, RowError("CSV header must include name, x and z")
+        return
+    for row in reader:
+        yield reader.line_num, {(k or "").strip().lower(): v for k, v in row.items()}
+
+
+def parse_xaero(lines):
+    """Xaero's Minimap: `waypoint:name:initials:x:y:z:color:disabled:...`; y is `~` when unknown."""
+    for no, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line.startswith("waypoint:"):
+            continue   # comments and `sets:` lines
+        parts = line.split(":")
+        if len(parts) < 6:
+            yield no, RowError("too few fields for a Xaero waypoint")
+            continue
+        yield no, {
+            "name": parts[1].replace("§§", ":"),   # Xaero escapes ':' in names as '§§'
+            "x": parts[3],
+            "y": None if parts[4] == "~" else parts[4],
+            "z": parts[5],
+        }
+
+
+def parse_json(text: str):
+    """JourneyMap waypoint JSON (one object per file) or a plain array of objects."""
+    try:
+        data = json.loads(text)
+    except ValueError:
+        yield 1, RowError("not valid JSON")
+        return
+    rows = data if isinstance(data, list) else [data]
+    for no, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            yield no, RowError("expected a JSON object")
+            continue
+        # JourneyMap 5.x keeps the position under "pos"
+        pos = row.get("pos") if isinstance(row.get("pos"), dict) else row
+        yield no, {"name": row.get("name"), "x": pos.get("x"), "y": pos.get("y"), "z": pos.get("z")}
+
+
+def detect_format(filename: str, head: str) -> str:
+    name = filename.lower()
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith(".json"):
+        return "json"
+    if "waypoint:" in head:
+        return "xaero"
+    first = next((line.strip() for line in head.splitlines() if line.strip()), "")
+    if first.startswith("{"):
+        return "jsonl"
+    return "csv"
+
+
+def iter_rows(data: bytes, filename: str):
+    """(format, iterator of parsed rows) for an uploaded file, decoded lazily line by line."""
+    fmt = detect_format(filename, data[:4096].decode("utf8", "replace"))
+    if fmt == "json":
+        return fmt, parse_json(data.decode("utf-8-sig"))
+    lines = io.TextIOWrapper(io.BytesIO(data), encoding="utf-8-sig", newline="")
+    parser = {"jsonl": parse_jsonl, "csv": parse_csv, "xaero": parse_xaero}[fmt]
+    return fmt, parser(lines)
+
+
+#
+# --- VALIDATION ---
+#
+
+def _int(value, field: str, limit: int) -> int:
+    if isinstance(value, bool):
+        raise RowError(f"{field} must be an integer")
+    try:
+        n = int(value) if not isinstance(value, float) or value.is_integer() else None
+    except (TypeError, ValueError):
+        n = None
+    if n is None:
+        raise RowError(f"{field} must be an integer")
+    if not -limit <= n <= limit:
+        raise RowError(f"{field} is out of range")
+    return n
+
+
+def validate_row(row: dict):
+    """-> (key, x, y, z) or raise RowError."""
+    name = row.get("name")
+    if not isinstance(name, str) or not name.strip():
+        raise RowError("missing name")
+    key = " ".join(name.split()).lower()
+    if len(key) > MAX_NAME_LEN:
+        raise RowError(f"name is longer than {MAX_NAME_LEN} characters")
+    x = _int(row.get("x"), "x", COORD_LIMIT)
+    z = _int(row.get("z"), "z", COORD_LIMIT)
+    y = row.get("y")
+    y = None if y in (None, "") else _int(y, "y", Y_LIMIT)
+    return key, x, y, z
+
+
+def validate_batch(batch, existing, seen: set):
+    """Validate parsed rows; returns (accepted [(line_no, key, x, y, z)], rejected [(line_no, reason)])."""
+    accepted, rejected = [], []
+    for no, row in batch:
+        if isinstance(row, RowError):
+            rejected.append((no, str(row)))
+            continue
+        try:
+            key, x, y, z = validate_row(row)
+        except RowError as e:
+            rejected.append((no, str(e)))
+            continue
+        if key in seen:
+            rejected.append((no, f"duplicate name `{key}` in file"))
+        elif key in existing:
+            rejected.append((no, f"`{key}` already exists"))
+        else:
+            seen.add(key)
+            accepted.append((no, key, x, y, z))
+    return accepted, rejected
+
+
+def batches(rows, size: int = BATCH_SIZE):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+#
+# --- EXPORT ---
+#
+
+def export_file(items, fmt: str):
+    """Write (name, record) pairs to a spooled temp file (in memory until 1 MiB) rewound for reading."""
+    out = SpooledTemporaryFile(max_size=1024 * 1024, mode="w+b")
+    text = codecs.getwriter("utf8")(out)
+    if fmt == "csv":
+        writer = csv.writer(text)
+        writer.writerow(CSV_FIELDS)
+        for name, r in items:
+            writer.writerow((name, r["x"], "" if r.get("y") is None else r["y"], r["z"],
+                             r["added_by"], r["added_at"]))
+    else:
+        for name, r in items:
+            text.write(json.dumps({"name": name, "x": r["x"], "y": r.get("y"), "z": r["z"],
+                                   "added_by": r["added_by"], "added_at": r["added_at"]}) + "\n")
+    out.seek(0)
+    return out
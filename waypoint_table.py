@@ -0,0 +1,175 @@
+from array import array
+from collections.abc import MutableMapping
+from datetime import date, datetime
+from functools import lru_cache
+
+DATE_FORMAT = "%m/%d/%y"
+NO_Y        = -2**31   # array sentinel for a waypoint saved without a Y level
+EPOCH       = date(1970, 1, 1).toordinal()
+
+
+@lru_cache(maxsize=4096)
+def _to_day(text: str) -> int:
+    """'%m/%d/%y' -> days since the Unix epoch; waypoints added the same day share one parse."""
+    return datetime.strptime(text, DATE_FORMAT).toordinal() - EPOCH
+
+
+@lru_cache(maxsize=4096)
+def _from_day(day: int) -> str:
+    return date.fromordinal(day + EPOCH).strftime(DATE_FORMAT)
+
+
+def _make_record(x: int, y: int, z: int, added_by: int, day: int) -> dict:
+    return {
+        "x": x,
+        "y": None if y == NO_Y else y,
+        "z": z,
+        "added_by": added_by,
+        "added_at": _from_day(day),
+    }
+
+
+class WaypointTable(MutableMapping):
+    """One guild's waypoints as parallel typed arrays instead of a dict per waypoint.
+
+    Coordinates live in 32-bit arrays, creator ids are interned into a per-table
+    list and dates are stored as days since the epoch. Lookups return a fresh
+    record dict, so callers must write changes back with table[name] = record.
+    Records that don't fit the arrays (coordinates past 32 bits, a date in
+    another format, a missing field) are kept as plain dicts.
+    """
+
+    def __init__(self, records=()):
+        self._rows    = {}   # name -> row index, or None when spilled; keeps insertion order
+        self._names   = []   # row -> name, for swap-removal
+        self._x       = array("i")
+        self._y       = array("i")
+        self._z       = array("i")
+        self._by      = array("I")   # index into _creators
+        self._day     = array("i")
+        self._creators   = []
+        self._creator_ix = {}
+        self._spill   = {}   # name -> record dict
+        self.update(records)
+
+    def _intern(self, user_id: int) -> int:
+        ix = self._creator_ix.get(user_id)
+        if ix is None:
+            ix = self._creator_ix[user_id] = len(self._creators)
+            self._creators.append(user_id)
+        return ix
+
+    def _record(self, row: int) -> dict:
+        return _make_record(self._x[row], self._y[row], self._z[row],
+                            self._creators[self._by[row]], self._day[row])
+
+    def __getitem__(self, name):
+        row = self._rows[name]
+        return self._spill[name] if row is None else self._record(row)
+
+    def __contains__(self, name):
+        return name in self._rows
+
+    def __setitem__(self, name, r):
+        y = r.get("y")
+        try:
+            packed = (r["x"], NO_Y if y is None else y, r["z"], _to_day(r["added_at"]))
+            if y == NO_Y:
+                raise OverflowError
+            x, y, z, day = array("i", packed)   # OverflowError/TypeError if it won't fit
+            added_by = r["added_by"]
+        except (KeyError, OverflowError, TypeError, ValueError):
+            self._remove_row(name)
+            self._rows[name] = None
+            self._spill[name] = dict(r)
+            return
+        self._spill.pop(name, None)
+        row = self._rows.get(name)
+        if row is None:
+            row = len(self._names)
+            self._names.append(name)
+            self._x.append(x)
+            self._y.append(y)
+            self._z.append(z)
+            self._by.append(self._intern(added_by))
+            self._day.append(day)
+            self._rows[name] = row
+        else:
+            self._x[row], self._y[row], self._z[row] = x, y, z
+            self._by[row] = self._intern(added_by)
+            self._day[row] = day
+
+    def _remove_row(self, name):
+        """Drop name's array row by moving the last row into its slot."""
+        row = self._rows.get(name)
+        if row is None:
+            return
+        last = len(self._names) - 1
+        if row != last:
+            moved = self._names[last]
+            for col in (self._x, self._y, self._z, self._by, self._day):
+                col[row] = col[last]
+            self._names[row] = moved
+            self._rows[moved] = row   # existing key: iteration order is unchanged
+        for col in (self._x, self._y, self._z, self._by, self._day):
+            col.pop()
+        self._names.pop()
+
+    def __delitem__(self, name):
+        if name not in self._rows:
+            raise KeyError(name)
+        self._remove_row(name)
+        del self._rows[name]
+        self._spill.pop(name, None)
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def items(self):
+        return [(name, self[name]) for name in self._rows]
+
+    def snapshot(self):
+        """(name, record) pairs read from a copy of the columns, one record built at a time.
+
+        The copy is about as compact as the table, so it can be handed to a
+        thread while the table keeps changing on the loop. Spilled records come last.
+        """
+        names, creators = self._names[:], self._creators[:]
+        cols = [col[:] for col in (self._x, self._y, self._z, self._by, self._day)]
+        spill = [(name, dict(r)) for name, r in self._spill.items()]
+
+        def pairs():
+            for name, x, y, z, by, day in zip(names, *cols):
+                yield name, _make_record(x, y, z, creators[by], day)
+            yield from spill
+        return pairs()
+
+
+class WaypointTables(dict):
+    """guild_id -> WaypointTable; plain dicts stored here are converted on the way in."""
+
+    def __init__(self, guilds=()):
+        super().__init__()
+        self.update(guilds)
+
+    def __setitem__(self, guild_id, records):
+        if not isinstance(records, WaypointTable):
+            records = WaypointTable(records)
+        super().__setitem__(guild_id, records)
+
+    def update(self, guilds=(), **kwargs):
+        # dict.update and |= write straight into the dict, skipping __setitem__
+        for guild_id, records in dict(guilds, **kwargs).items():
+            self[guild_id] = records
+
+    def __ior__(self, guilds):
+        self.update(guilds)
+        return self
+
+    def setdefault(self, guild_id, default=None):
+        if guild_id not in self:
+            self[guild_id] = default or ()
+        return self[guild_id]
@@ -1,51 +1,244 @@
+import asyncio
 import discord
+from typing import Literal
 from discord import app_commands
 from discord.ext import commands
-from discord.ui import View, button
 from datetime import datetime
-from utils import save_json, WAYPOINTS_PATH
-
-class WaypointPaginator(View):
-    def __init__(self, pages, author, footer_texts):
-        super().__init__(timeout=120)
-        self.pages = pages
-        self.current = 0
-        self.author = author
-        self.footer_texts = footer_texts
-
-    async def on_timeout(self):
-        for b in self.children:
-            b.disabled = True
-        await self.message.edit(view=self)
-
-    @button(label="◀️ Prev", style=discord.ButtonStyle.secondary)
-    async def prev_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if interaction.user != self.author:
-            return await interaction.response.send_message(
-                "Only the author can navigate.", ephemeral=True
-            )
-        if self.current > 0:
-            self.current -= 1
-            embed = self.pages[self.current]
-            embed.set_footer(text=self.footer_texts[self.current])
-            await interaction.response.edit_message(embed=embed, view=self)
-
-    @button(label="Next ▶️", style=discord.ButtonStyle.secondary)
-    async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if interaction.user != self.author:
-            return await interaction.response.send_message(
-                "Only the author can navigate.", ephemeral=True
-            )
-        if self.current < len(self.pages) - 1:
-            self.current += 1
-            embed = self.pages[self.current]
-            embed.set_footer(text=self.footer_texts[self.current])
-            await interaction.response.edit_message(embed=embed, view=self)
+from paginator import LazyPaginator
+from utils import WAYPOINTS_PATH
+from waypoint_index import NameIndex, SpatialGrid
+from waypoint_io import MAX_IMPORT_BYTES, MAX_NAME_LEN, EXPORT_FORMATS, batches, export_file, iter_rows, validate_batch
+from waypoint_table import WaypointTable
+
+MAX_RESULTS       = 25
+MAX_REJECTS_SHOWN = 10
+RENDER_GUILDS     = 32    # guilds whose rendered output is kept, least recently used dropped first
+RENDER_ENTRIES    = 256   # rendered pages / info embeds kept per guild
+
+def format_coords(r) -> str:
+    if r.get("y") is None:
+        return f"X: {r['x']}, Z: {r['z']}"
+    return f"X: {r['x']}, Y: {r['y']}, Z: {r['z']}"
+
+
+def list_field(name: str, r) -> dict:
+    if r is None:   # removed since the list was opened
+        return {"name": name.title(), "value": "*removed*", "inline": False}
+    return {"name": name.title(), "value": f"`{format_coords(r)}`", "inline": False}
+
+def info_payload(name: str, r) -> dict:
+    coords = [f"• X: `{r['x']}`"]
+    if r.get("y") is not None:
+        coords.append(f"• Y: `{r['y']}`")
+    coords.append(f"• Z: `{r['z']}`")
+    return {
+        "type":   "rich",
+        "title":  f"📍 Waypoint: {name.title()}",
+        "color":  0x00ff00,
+        "fields": [{"name": "Coordinates", "value": "\n".join(coords), "inline": False}],
+    }
+
+
+def _keep(cache: dict, key, value):
+    """Store value, dropping the oldest entry once the cache holds RENDER_ENTRIES."""
+    if len(cache) >= RENDER_ENTRIES:
+        del cache[next(iter(cache))]
+    cache[key] = value
+    return value
+
+
+class RenderCache:
+    """Formatted output for one guild's waypoints, valid while its version is unchanged.
+
+    Pages are formatted the first time they're shown, so the cost of a list
+    doesn't grow with the guild's waypoint count beyond copying its names.
+    """
+    __slots__ = ("version", "names", "pages", "info")
+
+    def __init__(self, version: int):
+        self.version = version
+        self.names   = None   # waypoint names in storage order, listed on the first !waypoints
+        self.pages   = {}     # page index -> embed field dicts
+        self.info    = {}     # name -> waypointinfo embed payload
+
+    def page(self, index: int, per_page: int, wps) -> list:
+        fields = self.pages.get(index)
+        if fields is None:
+            names = self.names[index * per_page : (index + 1) * per_page]
+            fields = _keep(self.pages, index, [list_field(n, wps.get(n)) for n in names])
+        return fields
+
+
+class WaypointPaginator(LazyPaginator):
+    PER_PAGE = 5
+
+    def __init__(self, cache: RenderCache, wps, author, footer_text):
+        self.cache = cache   # pinned to the version it was opened at; its names never change
+        self.wps = wps
+        self.footer_text = footer_text
+        super().__init__((len(cache.names) - 1) // self.PER_PAGE + 1, author)
+
+    def render(self, index: int) -> discord.Embed:
+        embed = discord.Embed.from_dict({
+            "type":   "rich",
+            "title":  "📍 Waypoints",
+            "color":  0x00ff00,
+            "fields": self.cache.page(index, self.PER_PAGE, self.wps),
+        })
+        embed.set_footer(text=f"Page {index+1}/{self.page_count} • {self.footer_text}")
+        return embed
 
 
 class WaypointCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        self._grids = {}   # guild_id -> SpatialGrid, built on first spatial query
+        self._names = {}   # guild_id -> NameIndex, built on first autocomplete
+        self._versions = {}   # guild_id -> bumped on every add/remove
+        self._renders  = {}   # guild_id -> RenderCache, least recently used first
+
+    def _grid(self, guild_id: str) -> SpatialGrid:
+        grid = self._grids.get(guild_id)
+        if grid is None:
+            grid = self._grids[guild_id] = SpatialGrid()
+            for n, r in self.bot.all_waypoints.get(guild_id, {}).items():
+                grid.add(n, r["x"], r["z"])
+        return grid
+
+    def _name_index(self, guild_id: str) -> NameIndex:
+        index = self._names.get(guild_id)
+        if index is None:
+            index = self._names[guild_id] = NameIndex(self.bot.all_waypoints.get(guild_id, {}))
+        return index
+
+    def _render_cache(self, guild_id: str) -> RenderCache:
+        version = self._versions.get(guild_id, 0)
+        cache = self._renders.pop(guild_id, None)
+        if cache is None or cache.version != version:
+            cache = RenderCache(version)
+        self._renders[guild_id] = cache   # most recently used last
+        if len(self._renders) > RENDER_GUILDS:
+            del self._renders[next(iter(self._renders))]
+        return cache
+
+    def _list_cache(self, guild_id: str, wps) -> RenderCache:
+        cache = self._render_cache(guild_id)
+        if cache.names is None:
+            cache.names = list(wps)
+        return cache
+
+    def _info_embed(self, guild_id: str, name: str, r) -> discord.Embed:
+        cache = self._render_cache(guild_id)
+        payload = cache.info.get(name)
+        if payload is None:
+            payload = _keep(cache.info, name, info_payload(name, r))
+        # from_dict keeps the field list by reference; copy it so the cached payload stays intact
+        return discord.Embed.from_dict({**payload, "fields": list(payload["fields"])})
+
+    def _bump(self, guild_id: str):
+        self._versions[guild_id] = self._versions.get(guild_id, 0) + 1
+
+    def _store_waypoint(self, guild_id: str, name: str, record: dict):
+        self.bot.all_waypoints.setdefault(guild_id, {})[name] = record
+        grid = self._grids.get(guild_id)
+        if grid is not None:
+            grid.add(name, record["x"], record["z"])
+        index = self._names.get(guild_id)
+        if index is not None:
+            index.add(name)
+        self._bump(guild_id)
+        self.bot.store.mark_dirty(WAYPOINTS_PATH)
+
+    def _store_waypoints(self, guild_id: str, records: dict):
+        """Bulk add: one update() (a single transaction on SQLite) and one mark_dirty."""
+        self.bot.all_waypoints.setdefault(guild_id, {}).update(records)
+        grid = self._grids.get(guild_id)
+        if grid is not None:
+            for name, record in records.items():
+                grid.add(name, record["x"], record["z"])
+        index = self._names.get(guild_id)
+        if index is not None:
+            index.update(records)
+        self._bump(guild_id)
+        self.bot.store.mark_dirty(WAYPOINTS_PATH)
+
+    def _delete_waypoint(self, guild_id: str, name: str):
+        del self.bot.all_waypoints[guild_id][name]
+        grid = self._grids.get(guild_id)
+        if grid is not None:
+            grid.remove(name)
+        index = self._names.get(guild_id)
+        if index is not None:
+            index.remove(name)
+        self._bump(guild_id)
+        self.bot.store.mark_dirty(WAYPOINTS_PATH)
+
+    async def _import(self, guild_id: str, author_id: int, attachment: discord.Attachment) -> str:
+        if attachment.size > MAX_IMPORT_BYTES:
+            return f"❌ File is too large (max {MAX_IMPORT_BYTES // (1024 * 1024)} MB)."
+        fmt, rows = iter_rows(await attachment.read(), attachment.filename)
+        wps = self.bot.all_waypoints.setdefault(guild_id, {})
+        added_at = datetime.now().strftime("%m/%d/%y")
+        records, line_of, rejected, seen = {}, {}, [], set()
+        for batch in batches(rows):
+            accepted, bad = validate_batch(batch, wps, seen)
+            for no, key, x, y, z in accepted:
+                records[key] = {"x": x, "y": y, "z": z, "added_by": author_id, "added_at": added_at}
+                line_of[key] = no
+            rejected.extend(bad)
+            await asyncio.sleep(0)   # let other commands run between batches
+        # names added while we yielded keep their existing waypoint; no await from here to the store
+        wps = self.bot.all_waypoints.setdefault(guild_id, {})
+        taken = [key for key in records if key in wps]
+        for key in taken:
+            del records[key]
+            rejected.append((line_of[key], f"`{key}` already exists"))
+        if taken:
+            rejected.sort()
+        if records:
+            self._store_waypoints(guild_id, records)
+
+        lines = [f"✅ Imported {len(records)} waypoint(s) from `{attachment.filename}` ({fmt})."]
+        if rejected:
+            lines.append(f"❌ Rejected {len(rejected)} row(s):")
+            lines += [f"• line {no}: {reason}" for no, reason in rejected[:MAX_REJECTS_SHOWN]]
+            if len(rejected) > MAX_REJECTS_SHOWN:
+                lines.append(f"…and {len(rejected) - MAX_REJECTS_SHOWN} more.")
+        return "\n".join(lines)[:2000]
+
+    async def _export(self, guild_id: str, fmt: str):
+        wps = self.bot.all_waypoints.get(guild_id, {})
+        if not wps:
+            return None
+        # snapshot on the loop; formatting happens off it. A WaypointTable copies its
+        # compact columns instead of building a dict per waypoint up front
+        items = wps.snapshot() if isinstance(wps, WaypointTable) else wps.items()
+        fp = await asyncio.to_thread(export_file, items, fmt)
+        return discord.File(fp, filename=f"waypoints-{guild_id}.{fmt}")
+
+    def _results_embed(self, title: str, guild_id: str, hits, footer: str):
+        wps = self.bot.all_waypoints.get(guild_id, {})
+        embed = discord.Embed(title=title, color=0x00ff00)
+        for dist, name in hits[:MAX_RESULTS]:
+            r = wps[name]
+            value = f"`{format_coords(r)}`"
+            if dist is not None:
+                value += f" • {round(dist)} blocks"
+            embed.add_field(name=name.title(), value=value, inline=False)
+        if len(hits) > MAX_RESULTS:
+            footer = f"Showing {MAX_RESULTS} of {len(hits)} • {footer}"
+        embed.set_footer(text=footer)
+        return embed
+
+    def _query_region(self, guild_id: str, nums):
+        """`x z radius` -> radius search, `x1 z1 x2 z2` -> box search."""
+        grid = self._grid(guild_id)
+        if len(nums) == 3:
+            x, z, radius = nums
+            return f"📍 Waypoints within {radius} of ({x}, {z})", grid.within_radius(x, z, radius)
+        x1, z1, x2, z2 = nums
+        hits = [(None, n) for n in grid.within_box(x1, z1, x2, z2)]
+        return f"📍 Waypoints in ({x1}, {z1}) → ({x2}, {z2})", hits
 
     #
     # --- PREFIX COMMANDS ---
@@ -87,16 +280,17 @@ class WaypointCog(commands.Cog):
         if not name_parts:
             return await ctx.send("❌ You must provide a name.")
         name_key = " ".join(name_parts).lower()
+        if len(name_key) > MAX_NAME_LEN:
+            return await ctx.send(f"❌ Waypoint names can be at most {MAX_NAME_LEN} characters.")
         if name_key in wps:
             return await ctx.send(f"❌ A waypoint named `{name_key}` already exists.")
-        wps[name_key] = {
+        self._store_waypoint(str(ctx.guild.id), name_key, {
             "x": x,
             "y": y,
             "z": z,
             "added_by": ctx.author.id,
             "added_at": datetime.now().strftime("%m/%d/%y")
-        }
-        save_json(WAYPOINTS_PATH, self.bot.all_waypoints)
+        })
         if y is None:
             coord_str = f"(X: {x}, Z: {z})"
         else:
@@ -123,8 +317,7 @@ class WaypointCog(commands.Cog):
         rec = wps[name]
         if ctx.author.id != rec["added_by"] and not ctx.author.guild_permissions.administrator:
             return await ctx.send("❌ Only the creator or an admin may remove this.")
-        del wps[name]
-        save_json(WAYPOINTS_PATH, self.bot.all_waypoints)
+        self._delete_waypoint(str(ctx.guild.id), name)
         await ctx.send(f"🗑️ Waypoint `{name}` removed.")
 
     @commands.command(
@@ -132,7 +325,7 @@ class WaypointCog(commands.Cog):
         help=(
             "**Usage**\n"
             "`!waypoints`\n\n"
-            "Lists all waypoint names and coords (5 per page).\n\n"
+            "Lists all waypoint names and coords (5 per page, with first/last and go-to-page buttons).\n\n"
             "**Example**\n"
             "`!waypoints`"
         )
@@ -141,26 +334,10 @@ class WaypointCog(commands.Cog):
         wps = self.bot.all_waypoints.setdefault(str(ctx.guild.id), {})
         if not wps:
             return await ctx.send("ℹ️ No waypoints added yet.")
-        entries = []
-        for n, r in wps.items():
-            coords = [f"X: {r['x']}"]
-            if r.get("y") is not None:
-                coords.append(f"Y: {r['y']}")
-            coords.append(f"Z: {r['z']}")
-            coord_str = "`" + ", ".join(coords) + "`"
-            entries.append((n.title(), coord_str))
-        pages, footers = [], []
-        total = (len(entries) - 1) // 5 + 1
-        for i in range(0, len(entries), 5):
-            embed = discord.Embed(title="📍 Waypoints", color=0x00ff00)
-            for name, coord in entries[i : i + 5]:
-                embed.add_field(name=name, value=coord, inline=False)
-            footer = f"Page {i//5+1}/{total} • Requested by {ctx.author.display_name}"
-            embed.set_footer(text=footer)
-            pages.append(embed)
-            footers.append(footer)
-        paginator = WaypointPaginator(pages, ctx.author, footers)
-        msg = await ctx.send(embed=pages[0], view=paginator)
+        paginator = WaypointPaginator(
+            self._list_cache(str(ctx.guild.id), wps), wps, ctx.author, f"Requested by {ctx.author.display_name}"
+        )
+        msg = await ctx.send(embed=paginator.first_page(), view=paginator)
         paginator.message = msg
 
     @commands.command(
@@ -181,15 +358,7 @@ class WaypointCog(commands.Cog):
         if name not in wps:
             return await ctx.send(f"❌ No waypoint named `{name}`.")
         r = wps[name]
-        embed = discord.Embed(
-            title=f"📍 Waypoint: {name.title()}",
-            color=0x00ff00
-        )
-        coords = [f"• X: `{r['x']}`"]
-        if r.get("y") is not None:
-            coords.append(f"• Y: `{r['y']}`")
-        coords.append(f"• Z: `{r['z']}`")
-        embed.add_field(name="Coordinates", value="\n".join(coords), inline=False)
+        embed = self._info_embed(str(ctx.guild.id), name, r)
         added_by = (
             ctx.guild.get_member(r['added_by']).display_name
             if ctx.guild.get_member(r['added_by']) else "Unknown"
@@ -200,6 +369,92 @@ class WaypointCog(commands.Cog):
         )
         await ctx.send(embed=embed)
 
+    @commands.has_permissions(administrator=True)
+    @commands.command(
+        name="waypointimport",
+        help=(
+            "**Usage**\n"
+            "`!waypointimport` with a file attached\n\n"
+            "Bulk-adds waypoints from JSON Lines, CSV (name,x,y,z), a Xaero's Minimap "
+            "waypoints file or JourneyMap waypoint JSON; admin only.\n\n"
+            "**Example**\n"
+            "`!waypointimport` + `waypoints.csv`"
+        )
+    )
+    async def waypointimport(self, ctx: commands.Context):
+        if not ctx.message.attachments:
+            return await ctx.send("❌ Attach a waypoint file to import.")
+        await ctx.send(await self._import(str(ctx.guild.id), ctx.author.id, ctx.message.attachments[0]))
+
+    @commands.command(
+        name="waypointexport",
+        help=(
+            "**Usage**\n"
+            "`!waypointexport [jsonl|csv]`\n\n"
+            "Exports this server's waypoints as a file (JSON Lines by default).\n\n"
+            "**Example**\n"
+            "`!waypointexport csv`"
+        )
+    )
+    async def waypointexport(self, ctx: commands.Context, fmt: str = "jsonl"):
+        fmt = fmt.lower()
+        if fmt not in EXPORT_FORMATS:
+            return await ctx.send("❌ Format must be `jsonl` or `csv`.")
+        file = await self._export(str(ctx.guild.id), fmt)
+        if file is None:
+            return await ctx.send("ℹ️ No waypoints added yet.")
+        await ctx.send(file=file)
+
+    @commands.command(
+        name="waypointnear",
+        help=(
+            "**Usage**\n"
+            "`!waypointnear <x> <z> [k]`\n\n"
+            f"Lists the k waypoints closest to X/Z (default 5, max {MAX_RESULTS}).\n\n"
+            "**Example**\n"
+            "`!waypointnear 100 -250 3`"
+        )
+    )
+    async def waypointnear(self, ctx: commands.Context, x: int = None, z: int = None, k: int = 5):
+        if x is None or z is None:
+            return await ctx.send("❌ Usage: `!waypointnear <x> <z> [k]`")
+        guild_id = str(ctx.guild.id)
+        hits = self._grid(guild_id).nearest(x, z, max(1, min(k, MAX_RESULTS)))
+        if not hits:
+            return await ctx.send("ℹ️ No waypoints added yet.")
+        await ctx.send(embed=self._results_embed(
+            f"📍 Waypoints near ({x}, {z})", guild_id, hits,
+            f"Requested by {ctx.author.display_name}"
+        ))
+
+    @commands.command(
+        name="waypointsin",
+        help=(
+            "**Usage**\n"
+            "`!waypointsin <x> <z> <radius>` or `!waypointsin <x1> <z1> <x2> <z2>`\n\n"
+            "Lists waypoints within a radius of X/Z, or inside a box.\n\n"
+            "**Example**\n"
+            "`!waypointsin 0 0 500`"
+        )
+    )
+    async def waypointsin(self, ctx: commands.Context, *args):
+        usage = "❌ Usage: `!waypointsin <x> <z> <radius>` or `!waypointsin <x1> <z1> <x2> <z2>`"
+        if len(args) not in (3, 4):
+            return await ctx.send(usage)
+        try:
+            nums = [int(a) for a in args]
+        except ValueError:
+            return await ctx.send("❌ Coordinates must be integers.")
+        if len(nums) == 3 and nums[2] < 0:
+            return await ctx.send("❌ Radius must not be negative.")
+        guild_id = str(ctx.guild.id)
+        title, hits = self._query_region(guild_id, nums)
+        if not hits:
+            return await ctx.send("ℹ️ No waypoints in that area.")
+        await ctx.send(embed=self._results_embed(
+            title, guild_id, hits, f"Requested by {ctx.author.display_name}"
+        ))
+
     #
     # --- SLASH COMMANDS ---
     #
@@ -224,12 +479,15 @@ class WaypointCog(commands.Cog):
     ):
         wps = self.bot.all_waypoints.setdefault(str(interaction.guild_id), {})
         key = name.lower()
+        if len(key) > MAX_NAME_LEN:
+            return await interaction.response.send_message(
+                f"❌ Waypoint names can be at most {MAX_NAME_LEN} characters.", ephemeral=True
+            )
         if key in wps:
             return await interaction.response.send_message(
                 f"❌ A waypoint named `{key}` already exists.", ephemeral=True
             )
-        wps[key] = {"x": x, "y": y, "z": z, "added_by": interaction.user.id, "added_at": datetime.now().strftime("%m/%d/%y")}        
-        save_json(WAYPOINTS_PATH, self.bot.all_waypoints)
+        self._store_waypoint(str(interaction.guild_id), key, {"x": x, "y": y, "z": z, "added_by": interaction.user.id, "added_at": datetime.now().strftime("%m/%d/%y")})
         if y is None:
             coord_str = f"(X: {x}, Z: {z})"
         else:
@@ -246,8 +504,7 @@ class WaypointCog(commands.Cog):
         rec = wps[key]
         if interaction.user.id != rec["added_by"] and not interaction.user.guild_permissions.administrator:
             return await interaction.response.send_message("❌ You may only remove your own.", ephemeral=True)
-        del wps[key]
-        save_json(WAYPOINTS_PATH, self.bot.all_waypoints)
+        self._delete_waypoint(str(interaction.guild_id), key)
         await interaction.response.send_message(f"🗑️ Waypoint `{key}` removed.")
 
     @app_commands.command(name="waypoints", description="List all waypoints (paginated)")
@@ -255,26 +512,11 @@ class WaypointCog(commands.Cog):
         wps = self.bot.all_waypoints.setdefault(str(interaction.guild_id), {})
         if not wps:
             return await interaction.response.send_message("ℹ️ No waypoints added.", ephemeral=True)
-        entries = []
-        for n, r in wps.items():
-            coords = [f"X: {r['x']}"]
-            if r.get("y") is not None:
-                coords.append(f"Y: {r['y']}")
-            coords.append(f"Z: {r['z']}")
-            coord_str = "`" + ", ".join(coords) + "`"
-            entries.append((n.title(), coord_str))
-        pages, footers = [], []
-        total = (len(entries) - 1) // 5 + 1
-        for i in range(0, len(entries), 5):
-            embed = discord.Embed(title="📍 Waypoints", color=0x00ff00)
-            for name, coord in entries[i : i + 5]:
-                embed.add_field(name=name, value=coord, inline=False)
-            footer = f"Page {i//5+1}/{total} • {interaction.user.display_name}"
-            embed.set_footer(text=footer)
-            pages.append(embed)
-            footers.append(footer)
-        paginator = WaypointPaginator(pages, interaction.user, footers)
-        await interaction.response.send_message(embed=pages[0], view=paginator)
+        paginator = WaypointPaginator(
+            self._list_cache(str(interaction.guild_id), wps), wps, interaction.user, interaction.user.display_name
+        )
+        await interaction.response.send_message(embed=paginator.first_page(), view=paginator)
+        paginator.message = await interaction.original_response()
 
     @app_commands.command(name="waypointinfo", description="Show details about a named waypoint")
     @app_commands.describe(name="Name of the waypoint")
@@ -284,16 +526,82 @@ class WaypointCog(commands.Cog):
         if key not in wps:
             return await interaction.response.send_message(f"❌ No waypoint named `{key}` found.", ephemeral=True)
         r = wps[key]
-        embed = discord.Embed(title=f"📍 Waypoint: {key.title()}", color=0x00ff00)
-        coords = [f"• X: `{r['x']}`"]
-        if r.get("y") is not None:
-            coords.append(f"• Y: `{r['y']}`")
-        coords.append(f"• Z: `{r['z']}`")
-        embed.add_field(name="Coordinates", value="\n".join(coords), inline=False)
+        embed = self._info_embed(str(interaction.guild_id), key, r)
         added_by = interaction.guild.get_member(r["added_by"]).display_name if interaction.guild.get_member(r["added_by"]) else "Unknown"
         embed.set_author(name=f"Added by {added_by}")
         embed.set_footer(text=f"Date added: {r['added_at']} • {interaction.user.display_name}")
         await interaction.response.send_message(embed=embed)
 
+    @waypointinfo_slash.autocomplete("name")
+    @waypointremove_slash.autocomplete("name")
+    async def waypoint_name_autocomplete(self, interaction: discord.Interaction, current: str):
+        names = self._name_index(str(interaction.guild_id)).search(current.strip().lower(), 25)
+        # one value over Discord's 100-character limit fails the whole response; such names
+        # predate the length check in waypointadd and can still be typed in full
+        return [app_commands.Choice(name=n.title()[:100], value=n) for n in names if len(n) <= MAX_NAME_LEN]
+
+    @app_commands.command(name="waypointimport", description="Bulk-add waypoints from a JSONL, CSV, Xaero or JourneyMap file; admin only")
+    @app_commands.describe(file="Waypoint file to import")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def waypointimport_slash(self, interaction: discord.Interaction, file: discord.Attachment):
+        await interaction.response.defer()
+        await interaction.followup.send(await self._import(str(interaction.guild_id), interaction.user.id, file))
+
+    @app_commands.command(name="waypointexport", description="Export this server's waypoints as a file")
+    @app_commands.describe(format="File format (default jsonl)")
+    async def waypointexport_slash(self, interaction: discord.Interaction, format: Literal["jsonl", "csv"] = "jsonl"):
+        file = await self._export(str(interaction.guild_id), format)
+        if file is None:
+            return await interaction.response.send_message("ℹ️ No waypoints added.", ephemeral=True)
+        await interaction.response.send_message(file=file)
+
+    @app_commands.command(name="waypointnear", description="List the waypoints closest to X/Z")
+    @app_commands.describe(
+        x="X coordinate (integer)",
+        z="Z coordinate (integer)",
+        k=f"How many waypoints (default 5, max {MAX_RESULTS})"
+    )
+    async def waypointnear_slash(self, interaction: discord.Interaction, x: int, z: int, k: int = 5):
+        guild_id = str(interaction.guild_id)
+        hits = self._grid(guild_id).nearest(x, z, max(1, min(k, MAX_RESULTS)))
+        if not hits:
+            return await interaction.response.send_message("ℹ️ No waypoints added.", ephemeral=True)
+        await interaction.response.send_message(embed=self._results_embed(
+            f"📍 Waypoints near ({x}, {z})", guild_id, hits, interaction.user.display_name
+        ))
+
+    @app_commands.command(name="waypointsin", description="List waypoints within a radius of X/Z, or inside a box")
+    @app_commands.describe(
+        x="X coordinate (centre, or first box corner)",
+        z="Z coordinate (centre, or first box corner)",
+        radius="Search radius in blocks",
+        x2="X coordinate of the opposite box corner",
+        z2="Z coordinate of the opposite box corner"
+    )
+    async def waypointsin_slash(
+        self,
+        interaction: discord.Interaction,
+        x: int,
+        z: int,
+        radius: int | None = None,
+        x2: int | None = None,
+        z2: int | None = None
+    ):
+        if radius is not None and radius >= 0 and x2 is None and z2 is None:
+            nums = [x, z, radius]
+        elif radius is None and x2 is not None and z2 is not None:
+            nums = [x, z, x2, z2]
+        else:
+            return await interaction.response.send_message(
+                "❌ Give either a non-negative `radius` or both `x2` and `z2`.", ephemeral=True
+            )
+        guild_id = str(interaction.guild_id)
+        title, hits = self._query_region(guild_id, nums)
+        if not hits:
+            return await interaction.response.send_message("ℹ️ No waypoints in that area.", ephemeral=True)
+        await interaction.response.send_message(embed=self._results_embed(
+            title, guild_id, hits, interaction.user.display_name
+        ))
+
 async def setup(bot: commands.Bot):
     await bot.add_cog(WaypointCog(bot))